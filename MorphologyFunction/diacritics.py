@@ -0,0 +1,133 @@
+"""
+Restores Turkish letters in text typed in ASCII, e.g. "gorusuruz" -> "görüşürüz".
+
+The index maps ASCII-folded word forms to the real forms of a lexicon,
+the most frequent first. Only folded forms of words with Turkish letters
+are stored, so the file stays compact. It is loaded into a dict once,
+so a lookup takes constant time.
+
+The module has no dependencies on the rest of the function. Every function
+is deployed from its own folder, so TranslationFunction and MorphologyFunction
+each have a copy of this file; change both, the copies must stay identical.
+
+File format: lines `folded \\t form \\t form ...`.
+Build it from a frequency list of Turkish word forms, lines `word [count]`:
+    python diacritics.py diacritics.tsv tr.txt
+"""
+from argparse import ArgumentParser
+from configparser import ConfigParser
+import os
+from pathlib import Path
+import re
+from typing import Optional
+
+
+TURKISH_TO_ASCII = str.maketrans("çğıöşüâîû", "cgiosuaiu")
+ASCII_WORD = re.compile(r"[A-Za-z]+")
+
+
+def turkish_lower(text: str) -> str:
+    return text.replace("I", "ı").replace("İ", "i").lower()
+
+
+def turkish_upper(text: str) -> str:
+    return text.replace("i", "İ").replace("ı", "I").upper()
+
+
+def match_case(form: str, typed: str) -> str:
+    "Capitalizes or uppercases the form like the typed word is."
+    if typed.isupper():
+        return turkish_upper(form)
+    if typed[:1].isupper():
+        return turkish_upper(form[:1]) + form[1:]
+    return form
+
+
+def fold(word: str) -> str:
+    "Lowercases the word and replaces Turkish letters by their ASCII look-alikes."
+    return turkish_lower(word).translate(TURKISH_TO_ASCII)
+
+
+class DiacriticsIndex:
+    "Real Turkish word forms by their ASCII-folded forms."
+
+    def __init__(self, path: str | Path) -> None:
+        self.forms: dict[str, tuple[str, ...]] = {}
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                folded, *forms = line.rstrip("\n").split("\t")
+                self.forms[folded] = tuple(forms)
+        print(f"Diacritics index with {len(self.forms)} entries is loaded")
+
+    @classmethod
+    def from_config(cls, path: str = "config.ini") -> Optional["DiacriticsIndex"]:
+        "Returns None if the index is not configured."
+        config = ConfigParser()
+        config.read(path)
+        index_path = config["DIACRITICS"].get("Path", "")
+        if not index_path or not os.path.exists(index_path):
+            return None
+        return cls(index_path)
+
+    def candidates(self, word: str) -> tuple[str, ...]:
+        "Forms the ASCII word could have been typed for, the most frequent first."
+        if not word.isascii():
+            return ()
+        return self.forms.get(fold(word), ())
+
+    def restore(self, text: str) -> str:
+        """
+        Replaces every ASCII word of the text by its most frequent form
+        in the same case. Words typed with Turkish letters, unknown words
+        and words which are most often written as typed, e.g. "sis" rather
+        than "şiş", are kept as they are. Lexicons list ASCII spellings
+        of common words too, "cok" is still restored to "çok".
+        """
+
+        def restore_word(match: re.Match) -> str:
+            word = match.group()
+            forms = self.candidates(word)
+            if not forms or forms[0] == fold(word):
+                return word
+            return match_case(forms[0], word)
+
+        return ASCII_WORD.sub(restore_word, text)
+
+
+def build_diacritics_index(path: Path, word_list: Path) -> int:
+    "Writes the index and returns the number of its entries."
+    counts: dict[str, int] = {}
+    with open(word_list, encoding="utf-8") as f:
+        lines = [line.split() for line in f if line.strip()]
+    for rank, parts in enumerate(lines):
+        if len(parts) > 1 and parts[-1].isdigit():
+            word, count = turkish_lower(" ".join(parts[:-1])), int(parts[-1])
+        else:
+            word, count = turkish_lower(" ".join(parts)), len(lines) - rank
+        counts[word] = max(counts.get(word, 0), count)
+
+    forms: dict[str, list[str]] = {}
+    for word in sorted(counts, key=counts.__getitem__, reverse=True):
+        forms.setdefault(fold(word), []).append(word)
+    entries = {
+        folded: words
+        for folded, words in forms.items()
+        if any(word != folded for word in words)
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        for folded, words in sorted(entries.items()):
+            f.write("\t".join([folded, *words]) + "\n")
+    return len(entries)
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Builds the diacritics restoration index.")
+    parser.add_argument("output", type=Path)
+    parser.add_argument("word_list", type=Path)
+    args = parser.parse_args()
+    count = build_diacritics_index(args.output, args.word_list)
+    print(f"{count} entries written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
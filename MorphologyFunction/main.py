@@ -6,7 +6,7 @@ from router import RequestRouter
 
 
 app = RequestRouter()
-morphology = Morphology()
+morphology = Morphology.from_config()
 
 
 @app.route("/check", "POST")
@@ -21,10 +21,33 @@ def analyze(data: dict[str, Any]) -> str:
     return morphology.analyze(word)
 
 
+@app.route("/check_batch", "POST")
+def check_batch(data: dict[str, Any]) -> list[bool]:
+    words = data["words"]
+    return morphology.check_batch(words)
+
+
+@app.route("/analyze_batch", "POST")
+def analyze_batch(data: dict[str, Any]) -> list[str]:
+    words = data["words"]
+    return morphology.analyze_batch(words)
+
+
 @app.route("/", "GET")
 def status(_: dict[str, Any]) -> str:
-    return """<title>MorphologyFunction</title>
+    page = """<title>MorphologyFunction</title>
     <H1>The function is online.</H1>"""
+    rows = "".join(
+        f"<tr><td>{name}</td><td>{s['hits']}</td><td>{s['misses']}</td>"
+        f"<td>{s['size']}</td><td>{s['hit rate']:.1%}</td></tr>"
+        for name, s in morphology.cache_stats().items()
+    )
+    page += f"""
+    <table>
+    <tr><th>Cache</th><th>Hits</th><th>Misses</th><th>Size</th><th>Hit rate</th></tr>
+    {rows}
+    </table>"""
+    return page
 
 
 @functions_framework.http
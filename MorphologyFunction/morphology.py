@@ -1,21 +1,28 @@
+from configparser import ConfigParser
 from dataclasses import dataclass
+from functools import lru_cache
 from io import StringIO
+from typing import Optional
 from zeyrek import MorphAnalyzer  # type: ignore
 from zeyrek.rulebasedanalyzer import _Single_Analysis  # type: ignore
 
+from diacritics import DiacriticsIndex
 
-@dataclass(slots=True)
+
+@dataclass(frozen=True, slots=True)
 class Morpheme:
     value: str
     name: str
 
 
-@dataclass(slots=True)
+@dataclass(frozen=True, slots=True)
 class WordAnalysis:
+    "Immutable, so cached analyses can be shared between calls."
+
     word: str
     pos: str
     lemma: str
-    morphemes: list[Morpheme]
+    morphemes: tuple[Morpheme, ...]
 
 
 class MorphemeCompressor:
@@ -34,8 +41,49 @@ class MorphemeCompressor:
 
 
 class Morphology:
-    def __init__(self) -> None:
+    """
+    Analyses and their formatted versions are memoized in LRU caches
+    of cache_size words each, keyed by the word with restored Turkish letters,
+    so /check and /analyze of the same word parse it only once.
+    """
+
+    def __init__(
+        self, diacritics: Optional[DiacriticsIndex] = None, cache_size: int = 4096
+    ) -> None:
         self.analyzer = MorphAnalyzer()
+        self.diacritics = diacritics
+        self.cached_analyses = lru_cache(maxsize=cache_size)(self._parse)
+        self.cached_formatted = lru_cache(maxsize=cache_size)(self._format)
+
+    @classmethod
+    def from_config(cls, path: str = "config.ini") -> "Morphology":
+        config = ConfigParser()
+        config.read(path)
+        cache_size = config["MORPHOLOGY"].getint("Cache size", 4096)
+        return cls(DiacriticsIndex.from_config(path), cache_size)
+
+    def cache_stats(self) -> dict[str, dict[str, float]]:
+        "Hits, misses, size and hit rate of the caches."
+        infos = {
+            "analyses": self.cached_analyses.cache_info(),
+            "formatted": self.cached_formatted.cache_info(),
+        }
+        stats = {}
+        for name, info in infos.items():
+            calls = info.hits + info.misses
+            stats[name] = {
+                "hits": info.hits,
+                "misses": info.misses,
+                "size": info.currsize,
+                "hit rate": info.hits / calls if calls else 0.0,
+            }
+        return stats
+
+    def restore(self, word: str) -> str:
+        "Restores Turkish letters if the word is typed in ASCII."
+        if self.diacritics is None:
+            return word
+        return self.diacritics.restore(word)
 
     def parse_single_analysis(
         self, word: str, analysis: _Single_Analysis
@@ -43,7 +91,7 @@ class Morphology:
         dict_item = analysis.dict_item
         lemma = dict_item.lemma
         pos = dict_item.primary_pos.name
-        morphemes = [Morpheme(m[1], m[0].name) for m in analysis.morphemes]
+        morphemes = tuple(Morpheme(m[1], m[0].name) for m in analysis.morphemes)
         return WordAnalysis(word, pos, lemma, morphemes)
 
     def format_analysis(self, a: WordAnalysis) -> str:
@@ -64,20 +112,25 @@ class Morphology:
         result.write(f"<code>={a.word.rjust(max_len)}|</code><b>{a.pos}</b>\n")
         return result.getvalue()
 
-    def extract_analyses(self, word: str) -> list[WordAnalysis]:
+    def _parse(self, word: str) -> tuple[WordAnalysis, ...]:
         parsed = self.analyzer._parse(word)
         if not parsed:
-            return []
-        return [self.parse_single_analysis(word, p) for p in parsed]
+            return ()
+        return tuple(self.parse_single_analysis(word, p) for p in parsed)
 
-    def analyze(self, word: str) -> str:
+    def _format(self, word: str) -> str:
         result = StringIO()
-        analyses = self.extract_analyses(word)
-        for a in analyses:
+        for a in self.cached_analyses(word):
             result.write(self.format_analysis(a))
             result.write("\n")
         return result.getvalue().strip()
 
+    def extract_analyses(self, word: str) -> tuple[WordAnalysis, ...]:
+        return self.cached_analyses(self.restore(word))
+
+    def analyze(self, word: str) -> str:
+        return self.cached_formatted(self.restore(word))
+
     def get_lemmas(self, word: str) -> set[str]:
         analyses = self.extract_analyses(word)
         return {a.lemma for a in analyses}
@@ -86,6 +139,16 @@ class Morphology:
         lemmas = self.get_lemmas(word)
         if not lemmas:
             return False
-        if word in lemmas:
+        if self.restore(word) in lemmas:
             return False
         return True
+
+    def check_batch(self, words: list[str]) -> list[bool]:
+        "Checks every distinct word once, results are in the order of the words."
+        results = {word: self.check_if_interesting(word) for word in set(words)}
+        return [results[word] for word in words]
+
+    def analyze_batch(self, words: list[str]) -> list[str]:
+        "Analyzes every distinct word once, results are in the order of the words."
+        results = {word: self.analyze(word) for word in set(words)}
+        return [results[word] for word in words]
@@ -43,6 +43,6 @@ class RequestRouter:
         except KeyError:
             print(f"Dispatch error: {path, method}")
             return abort(404)
-        data = json.loads(request.data)
+        data = json.loads(request.data) if request.data else {}
         print(f"Calling {f.__name__} function with data={data}.")
         return jsonify(f(data))
@@ -16,6 +16,8 @@ class Language(str, Enum):
     russian = auto()
     turkish = auto()
     english = auto()
+    german = auto()
+    azerbaijani = auto()
 
 
 def detect_language(text: str) -> Optional[Language]:
@@ -43,7 +45,7 @@ TURKISH_UPPER_TO_LOWER = {
 
 def lowercase(text: str, language: Optional[Language]) -> str:
     match language:
-        case Language.turkish:
+        case Language.turkish | Language.azerbaijani:
             for k, v in TURKISH_UPPER_TO_LOWER.items():
                 text = text.replace(k, v)
             return text.lower()
@@ -0,0 +1,122 @@
+import asyncio
+from concurrent.futures import Future
+from configparser import ConfigParser
+import os
+import threading
+from typing import Any, Coroutine, Optional, TypeVar
+
+from aiohttp import ClientSession, TCPConnector  # type: ignore
+from fake_useragent import UserAgent  # type: ignore
+
+
+T = TypeVar("T")
+
+
+class BackgroundLoop:
+    """
+    An event loop running forever in a daemon thread.
+    Request threads submit coroutines to it instead of starting their own loops,
+    so sessions and connections opened on it outlive a single request.
+
+    The thread is started on first use and started again in a forked process:
+    functions-framework imports main.py in the gunicorn master and forks
+    the workers afterwards, and threads don't survive a fork.
+    """
+
+    def __init__(self) -> None:
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.thread: Optional[threading.Thread] = None
+        self.pid = 0
+        self.lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        "The loop running in this process, started if it isn't yet."
+        with self.lock:
+            if self._loop is None or self.pid != os.getpid():
+                self._loop = asyncio.new_event_loop()
+                self.thread = threading.Thread(
+                    target=self._loop.run_forever, name="background-loop", daemon=True
+                )
+                self.thread.start()
+                self.pid = os.getpid()
+            return self._loop
+
+    def submit(self, coroutine: Coroutine[Any, Any, T]) -> "Future[T]":
+        "Schedules the coroutine on the loop, safe to call from any thread."
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def run(
+        self, coroutine: Coroutine[Any, Any, T], timeout: Optional[float] = None
+    ) -> T:
+        "Runs the coroutine on the loop and waits for its result."
+        return self.submit(coroutine).result(timeout)
+
+    @property
+    def running(self) -> bool:
+        "Whether the loop has been started in this process and is running."
+        return (
+            self.thread is not None
+            and self.pid == os.getpid()
+            and self.thread.is_alive()
+        )
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        "Stops the loop and closes it once its thread is done."
+        if not self.running or self._loop is None or self.thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self.thread.join(timeout)
+        if not self.thread.is_alive():
+            self._loop.close()
+
+
+class SessionPool:
+    """
+    One keep-alive session per upstream host, created on first use.
+    Must be used from coroutines running on the background loop.
+    """
+
+    def __init__(
+        self,
+        limit_per_host: int = 8,
+        dns_cache_ttl: int = 300,
+        keepalive_timeout: float = 60,
+    ) -> None:
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.sessions: dict[str, ClientSession] = {}
+
+    @classmethod
+    def from_config(cls, path: str = "config.ini") -> "SessionPool":
+        config = ConfigParser()
+        config.read(path)
+        section = config["SESSIONS"]
+        return cls(
+            limit_per_host=section.getint("Limit per host", 8),
+            dns_cache_ttl=section.getint("DNS cache TTL", 300),
+            keepalive_timeout=section.getfloat("Keepalive timeout", 60),
+        )
+
+    def get(self, host: Optional[str]) -> ClientSession:
+        key = host or ""
+        session = self.sessions.get(key)
+        if session is None or session.closed:
+            connector = TCPConnector(
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_cache_ttl,
+                use_dns_cache=True,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            session = ClientSession(
+                connector=connector,
+                headers={"UserAgent": UserAgent().random},
+            )
+            self.sessions[key] = session
+        return session
+
+    async def close(self) -> None:
+        for session in self.sessions.values():
+            await session.close()
+        self.sessions.clear()
@@ -0,0 +1,102 @@
+"""
+Accuracy and speed of language detection on labelled samples.
+
+Compares detect_language, which picks the first language written with the
+letters of the text, with the scored LanguageDetector. Reports accuracy per
+language, the share of texts whose language is among the top two detected,
+the most frequent confusions and the mean time per call.
+Only the languages the translator translates from are considered,
+samples in other languages are skipped.
+
+Samples are lines `language \\t text`. Run from the TranslationFunction folder:
+    python -m benchmarks.bench_detection --tables detection.tsv \\
+        --samples benchmarks/detection_samples.tsv \\
+        --languages russian turkish english
+"""
+from argparse import ArgumentParser
+from collections import Counter
+from pathlib import Path
+import time
+from typing import Callable, Optional
+
+from detection import LanguageDetector
+from languages import Language, detect_language
+
+
+def read_samples(path: Path) -> list[tuple[Language, str]]:
+    with open(path, encoding="utf-8") as f:
+        rows = [line.rstrip("\n").split("\t", 1) for line in f if line.strip()]
+    return [(Language[language], text) for language, text in rows]
+
+
+def report(
+    name: str,
+    detect: Callable[[str], list[Language]],
+    samples: list[tuple[Language, str]],
+    repeat: int,
+) -> None:
+    correct: Counter[Language] = Counter()
+    top_two: Counter[Language] = Counter()
+    total: Counter[Language] = Counter()
+    confusions: Counter[tuple[Language, Optional[Language]]] = Counter()
+    for language, text in samples:
+        detected = detect(text)
+        total[language] += 1
+        top = detected[0] if detected else None
+        if top == language:
+            correct[language] += 1
+        else:
+            confusions[(language, top)] += 1
+        if language in detected[:2]:
+            top_two[language] += 1
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for _, text in samples:
+            detect(text)
+    seconds = (time.perf_counter() - start) / repeat / len(samples)
+
+    print(f"\n{name}: {seconds * 1e6:.1f}µs per text")
+    print(f"{'':<14}{'accuracy':>10}{'top two':>10}{'texts':>8}")
+    for language in total:
+        print(
+            f"{language.name:<14}{correct[language] / total[language]:>10.0%}"
+            f"{top_two[language] / total[language]:>10.0%}{total[language]:>8}"
+        )
+    overall = sum(correct.values()) / len(samples)
+    overall_top_two = sum(top_two.values()) / len(samples)
+    print(f"{'overall':<14}{overall:>10.0%}{overall_top_two:>10.0%}{len(samples):>8}")
+    for (language, top), count in confusions.most_common(5):
+        detected_name = top.name if top is not None else "none"
+        print(f"  {language.name} detected as {detected_name}: {count}")
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--tables", type=Path, default=Path("detection.tsv"))
+    parser.add_argument(
+        "--samples", type=Path, default=Path("benchmarks/detection_samples.tsv")
+    )
+    parser.add_argument("--repeat", type=int, default=100)
+    parser.add_argument(
+        "--languages", nargs="+", default=["russian", "turkish", "english"]
+    )
+    args = parser.parse_args()
+
+    languages = [Language[name] for name in args.languages]
+    samples = [x for x in read_samples(args.samples) if x[0] in languages]
+    detector = LanguageDetector.load(args.tables)
+
+    def by_letters(text: str) -> list[Language]:
+        language = detect_language(text)
+        return [language] if language is not None else []
+
+    def by_scores(text: str) -> list[Language]:
+        return [language for language, _ in detector.scores(text, languages)]
+
+    report("detect_language", by_letters, samples, args.repeat)
+    report("LanguageDetector", by_scores, samples, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Load benchmark of the translator against the local mock server.
+
+Scraping services are pointed at benchmarks.mock_server, the Google client is
+replaced with a fake one sleeping for the configured latency. Translator.translate
+and get_translation are run from concurrent threads, the report contains
+p50/p95/p99 latency and throughput end to end and per service, and peak RSS.
+The translation and HTTP caches are disabled, so every request does a full fan-out,
+and so are the host limiters, so the numbers reflect parsing and the fan-out rather
+than the rate limits of the real sites; --keep-limits keeps them.
+
+Run from the TranslationFunction folder:
+    python -m benchmarks.bench_load --requests 200 --concurrency 8 \\
+        --latency 0.2 --failure-rate 0.05 --service-latency glosbe.com=1.5
+"""
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+import resource
+import statistics
+import time
+from typing import Any, Callable
+from urllib.parse import urlsplit
+
+from benchmarks.mock_server import (
+    Injection,
+    MockServer,
+    add_injection_arguments,
+    injection_from_arguments,
+)
+from translation import (
+    GoogleTranslate,
+    ScrapingService,
+    Translator,
+    get_translation,
+)
+
+
+class FakeGoogleClient:
+    "Stands in for translate.Client, blocks for the configured latency."
+
+    def __init__(self, injection: Injection) -> None:
+        self.injection = injection
+        self.requests = 0
+
+    def translate(self, values: list[str], **_: Any) -> list[dict[str, str]]:
+        time.sleep(self.injection.delay("google.com"))
+        self.requests += 1
+        return [{"translatedText": value} for value in values]
+
+
+@dataclass
+class Report:
+    name: str
+    latencies: list[float] = field(default_factory=list)
+    services: dict[str, list[float]] = field(default_factory=dict)
+    seconds: float = 0.0
+    peak_memory: int = 0
+
+    def add_timings(self, timings: dict[str, dict[str, float]]) -> None:
+        for by_service in timings.values():
+            for service_name, elapsed in by_service.items():
+                self.services.setdefault(service_name, []).append(elapsed)
+
+    def print(self) -> None:
+        throughput = len(self.latencies) / self.seconds if self.seconds else 0.0
+        print(
+            f"\n{self.name}: {len(self.latencies)} requests in {self.seconds:.2f}s, "
+            f"{throughput:.1f} req/s, peak RSS {self.peak_memory / 2**20:.1f} MiB"
+        )
+        print(f"{'':<20}{'p50':>10}{'p95':>10}{'p99':>10}")
+        print_percentiles("end to end", self.latencies)
+        for service_name, latencies in sorted(self.services.items()):
+            print_percentiles(service_name, latencies)
+
+
+def print_percentiles(name: str, latencies: list[float]) -> None:
+    if len(latencies) < 2:
+        print(f"{name:<20}{'not enough data':>30}")
+        return
+    q = statistics.quantiles(latencies, n=100, method="inclusive")
+    p50, p95, p99 = (q[i] * 1000 for i in (49, 94, 98))
+    print(f"{name:<20}{p50:>8.0f}ms{p95:>8.0f}ms{p99:>8.0f}ms")
+
+
+def point_services_to(
+    server: MockServer, injection: Injection, keep_limits: bool
+) -> None:
+    ScrapingService.http_cache = None
+    for service in Translator.services:
+        if isinstance(service, ScrapingService):
+            if not keep_limits:
+                service.limiter = None
+            url = urlsplit(service.URL)
+            origin = f"{url.scheme}://{url.netloc}"
+            service.URL = service.URL.replace(
+                origin, server.base_url(service.service_name)
+            )
+        if isinstance(service, GoogleTranslate):
+            service.client.client = FakeGoogleClient(injection)
+
+
+def run(
+    name: str,
+    call: Callable[[str], dict[str, dict[str, float]]],
+    words: list[str],
+    requests: int,
+    concurrency: int,
+) -> Report:
+    report = Report(name)
+
+    def timed_call(i: int) -> None:
+        start = time.perf_counter()
+        timings = call(words[i % len(words)])
+        report.latencies.append(time.perf_counter() - start)
+        report.add_timings(timings)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(timed_call, range(requests)))
+    report.seconds = time.perf_counter() - start
+    # tracemalloc would slow parsing down and distort latencies, so the peak
+    # resident set size of the process (kilobytes on linux) is reported instead.
+    report.peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return report
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__)
+    add_injection_arguments(parser)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--words", nargs="+", default=None)
+    parser.add_argument(
+        "--keep-limits",
+        action="store_true",
+        help="keep the per-host rate limits and concurrency caps of the real sites",
+    )
+    args = parser.parse_args()
+
+    injection = injection_from_arguments(args)
+    server = MockServer(args.fixtures, injection)
+    server.start()
+    point_services_to(server, injection, args.keep_limits)
+    words = (
+        args.words
+        or sorted({page.word for pages in server.pages.values() for page in pages})
+        or ["kedi"]
+    )
+    translator = Translator()
+
+    def translate(word: str) -> dict[str, dict[str, float]]:
+        translations = translator.translate(word)
+        if translations is None:
+            return {}
+        return {dst.src.name: dst.timings for dst in translations.dsts}
+
+    def translate_and_render(word: str) -> dict[str, dict[str, float]]:
+        return get_translation(translator, word).timings
+
+    for name, call in (
+        ("Translator.translate", translate),
+        ("get_translation", translate_and_render),
+    ):
+        run(name, call, words, args.requests, args.concurrency).print()
+    print(f"\nMock server answered {server.requests} requests")
+    for service in Translator.services:
+        if isinstance(service, GoogleTranslate):
+            batcher = service.batcher
+            print(
+                f"Google Translate got {batcher.values} values "
+                f"in {batcher.requests} requests"
+            )
+    translator.close()
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Compares parsing backends on saved dictionary pages.
+
+Pages are looked up as <pages>/<service name>/<src code>_<dst code>_<anything>.html
+with language codes as used by the service, e.g. pages/glosbe.com/tr_ru_kedi.html
+or pages/tureng.com/turkish_english_kedi.html. The committed pages are stand-ins
+written by benchmarks.record_pages --synthetic, record live pages with it
+for numbers of the real sites.
+
+Run from the TranslationFunction folder:
+    python -m benchmarks.bench_parsing --pages benchmarks/pages --repeat 20
+"""
+from argparse import ArgumentParser
+from dataclasses import dataclass
+from pathlib import Path
+import sys
+import time
+import tracemalloc
+from typing import Optional
+
+from parsing import LXML_AVAILABLE, ParsingBackend, SoupParser
+from translation import ScrapingService, Translator
+
+
+@dataclass
+class Page:
+    service: ScrapingService
+    src_language_code: str
+    dst_language_code: str
+    html: str
+    path: Path
+
+
+@dataclass
+class Measurement:
+    result: Optional[str]
+    seconds: float
+    peak_memory: int
+
+
+def load_pages(folder: Path) -> list[Page]:
+    services = {
+        s.service_name: s for s in Translator.services if isinstance(s, ScrapingService)
+    }
+    pages = []
+    for path in sorted(folder.glob("*/*.html")):
+        service = services.get(path.parent.name)
+        if service is None:
+            print(f"Skipping {path}: unknown service")
+            continue
+        src, dst, _ = path.stem.split("_", 2)
+        pages.append(Page(service, src, dst, path.read_text(encoding="utf-8"), path))
+    return pages
+
+
+def measure(page: Page, backend: ParsingBackend, repeat: int) -> Measurement:
+    service = page.service
+    service.parser = SoupParser(backend)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = service.extract_from_html(
+            page.html, page.src_language_code, page.dst_language_code
+        )
+    seconds = (time.perf_counter() - start) / repeat
+
+    tracemalloc.start()
+    service.extract_from_html(page.html, page.src_language_code, page.dst_language_code)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return Measurement(result, seconds, peak_memory)
+
+
+def main() -> int:
+    argument_parser = ArgumentParser(description=__doc__)
+    argument_parser.add_argument("--pages", type=Path, default=Path("benchmarks/pages"))
+    argument_parser.add_argument("--repeat", type=int, default=20)
+    args = argument_parser.parse_args()
+
+    backends = [b for b in ParsingBackend if b != ParsingBackend.lxml or LXML_AVAILABLE]
+    pages = load_pages(args.pages)
+    if not pages:
+        print(f"No pages found in {args.pages}")
+        return 1
+
+    mismatches = 0
+    totals = {b: 0.0 for b in backends}
+    print(f"{'page':<48}" + "".join(f"{b.value:>22}" for b in backends))
+    for page in pages:
+        measurements = {b: measure(page, b, args.repeat) for b in backends}
+        row = f"{str(page.path.relative_to(args.pages)):<48}"
+        for backend, m in measurements.items():
+            totals[backend] += m.seconds
+            row += f"{m.seconds * 1000:>10.2f} ms {m.peak_memory / 2**20:>6.1f} MiB"
+        print(row)
+        reference = measurements[ParsingBackend.full].result
+        for backend, m in measurements.items():
+            if m.result != reference:
+                mismatches += 1
+                print(f"  MISMATCH {backend.value}: {m.result!r} != {reference!r}")
+
+    total_row = "".join(f"{totals[b] * 1000:>13.2f} ms{'':>7}" for b in backends)
+    print(f"{'total':<48}{total_row}")
+    print(f"{mismatches} mismatches")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
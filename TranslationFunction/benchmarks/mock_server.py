@@ -0,0 +1,157 @@
+"""
+Local stand-in for the scraped dictionary sites.
+
+Serves recorded pages from <fixtures>/<service name>/*.html (the layout used by
+bench_parsing) under /<service name>/<original path>, with injected latency
+and failures. Of the pages whose word ends the requested path the one whose
+language codes are in the path is served, e.g. tr_en_kedi.html for
+/glosbe.com/tr/en/kedi, the first page of the service if no word matches.
+
+Run standalone from the TranslationFunction folder:
+    python -m benchmarks.mock_server --fixtures benchmarks/pages --port 8080
+"""
+from argparse import ArgumentParser, Namespace
+import asyncio
+from dataclasses import dataclass, field
+from pathlib import Path
+import random
+import re
+import threading
+from typing import Optional
+from urllib.parse import unquote_plus
+
+from aiohttp import web  # type: ignore
+
+
+@dataclass
+class Injection:
+    latency: float = 0.1
+    "Mean latency of a response in seconds."
+    jitter: float = 0.5
+    "Latency is uniformly distributed in latency * [1 - jitter, 1 + jitter]."
+    failure_rate: float = 0.0
+    "Share of requests answered with 503."
+    hang_rate: float = 0.0
+    "Share of requests which are never answered in time."
+    service_latency: dict[str, float] = field(default_factory=dict)
+    "Per-service overrides of the mean latency."
+
+    def delay(self, service_name: str) -> float:
+        latency = self.service_latency.get(service_name, self.latency)
+        return latency * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+
+@dataclass
+class Fixture:
+    src_language_code: str
+    dst_language_code: str
+    word: str
+    html: str
+
+    def codes_in(self, segments: list[str]) -> int:
+        "Number of the language codes of the page among the segments of a path."
+        codes = (self.src_language_code, self.dst_language_code)
+        return sum(code in segments for code in codes)
+
+
+class MockServer:
+    def __init__(self, fixtures: Path, injection: Injection) -> None:
+        self.injection = injection
+        self.pages: dict[str, list[Fixture]] = {}
+        for path in sorted(fixtures.glob("*/*.html")):
+            src, dst, word = path.stem.split("_", 2)
+            fixture = Fixture(src, dst, word, path.read_text(encoding="utf-8"))
+            self.pages.setdefault(path.parent.name, []).append(fixture)
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.runner: Optional[web.AppRunner] = None
+        self.port = 0
+        self.requests = 0
+
+    def base_url(self, service_name: str) -> str:
+        return f"http://127.0.0.1:{self.port}/{service_name}"
+
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        self.requests += 1
+        service_name = request.match_info["service"]
+        pages = self.pages.get(service_name)
+        if not pages:
+            return web.Response(status=404)
+
+        roll = random.random()
+        if roll < self.injection.hang_rate:
+            await asyncio.sleep(60)
+        await asyncio.sleep(self.injection.delay(service_name))
+        if roll < self.injection.hang_rate + self.injection.failure_rate:
+            return web.Response(status=503)
+
+        requested = unquote_plus(request.path_qs).lower()
+        segments = re.split(r"[/?=&-]", requested)
+        matching = [p for p in pages if p.word == segments[-1]] or pages[:1]
+        page = max(matching, key=lambda p: p.codes_in(segments))
+        return web.Response(text=page.html, content_type="text/html")
+
+    async def _start(self, port: int) -> None:
+        app = web.Application()
+        app.router.add_get("/{service}/{tail:.*}", self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", port)
+        await site.start()
+        self.port = self.runner.addresses[0][1]
+
+    def start(self, port: int = 0) -> None:
+        "Starts the server in a background thread."
+        self.loop = asyncio.new_event_loop()
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
+        asyncio.run_coroutine_threadsafe(self._start(port), self.loop).result()
+
+    def stop(self) -> None:
+        if self.loop is None or self.runner is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.runner.cleanup(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+def parse_service_latency(values: list[str]) -> dict[str, float]:
+    "Parses `service=seconds` pairs."
+    result = {}
+    for value in values:
+        name, seconds = value.split("=")
+        result[name] = float(seconds)
+    return result
+
+
+def add_injection_arguments(parser: ArgumentParser) -> None:
+    parser.add_argument("--fixtures", type=Path, default=Path("benchmarks/pages"))
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--jitter", type=float, default=0.5)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--hang-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--service-latency", action="append", default=[], metavar="SERVICE=SECONDS"
+    )
+
+
+def injection_from_arguments(args: Namespace) -> Injection:
+    return Injection(
+        latency=args.latency,
+        jitter=args.jitter,
+        failure_rate=args.failure_rate,
+        hang_rate=args.hang_rate,
+        service_latency=parse_service_latency(args.service_latency),
+    )
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Serves recorded dictionary pages.")
+    add_injection_arguments(parser)
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+    server = MockServer(args.fixtures, injection_from_arguments(args))
+    server.start(args.port)
+    print(f"Serving {sorted(server.pages)} on http://127.0.0.1:{server.port}")
+    threading.Event().wait()
+
+
+if __name__ == "__main__":
+    main()
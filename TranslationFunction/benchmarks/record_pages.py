@@ -0,0 +1,237 @@
+"""
+Records dictionary pages for bench_parsing and the mock server of bench_load.
+
+Every scraping service is asked for each word from the source language to each
+target language it supports, with the URL the service builds itself, and the page
+is saved as
+<pages>/<service name>/<src code>_<dst code>_<word>.html. Pages shared by
+several languages are fetched once and saved for each of them.
+
+Run from the TranslationFunction folder:
+    python -m benchmarks.record_pages --pages benchmarks/pages --words kedi ev kitap \\
+        --source turkish --targets russian english
+
+Without network access --synthetic writes stand-in pages instead: the markup
+extract reads (the same for every word) in the middle of a page padded with
+navigation, scripts and articles to --size kilobytes. The random text is seeded,
+so the pages are reproduced byte for byte. The committed fixtures are such pages,
+recorded pages replace them.
+"""
+from argparse import ArgumentParser
+import asyncio
+from pathlib import Path
+import random
+from typing import Callable
+
+from aiohttp import ClientSession, ClientTimeout  # type: ignore
+
+from languages import Language
+from translation import ScrapingService, Translator
+
+
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64; rv:109.0) Gecko/20100101 Firefox/115.0"
+
+
+def page_paths(
+    service: ScrapingService, word: str, src: Language, dsts: list[Language]
+) -> dict[str, list[tuple[str, str]]]:
+    "Language code pairs to save the page for by its URL."
+    urls: dict[str, list[tuple[str, str]]] = {}
+    for dst in dsts:
+        if (src, dst) not in service.supported_languages:
+            continue
+        src_code = service._encode_language(src)  # pylint: disable=protected-access
+        dst_code = service._encode_language(dst)  # pylint: disable=protected-access
+        url = service.build_url(word, src_code, dst_code)
+        urls.setdefault(url, []).append((src_code, dst_code))
+    return urls
+
+
+async def record(
+    folder: Path, words: list[str], src: Language, dsts: list[Language], delay: float
+) -> int:
+    "Saves live pages and returns their number."
+    saved = 0
+    timeout = ClientTimeout(total=30)
+    headers = {"User-Agent": USER_AGENT}
+    async with ClientSession(timeout=timeout, headers=headers) as session:
+        for service in Translator.services:
+            if not isinstance(service, ScrapingService):
+                continue
+            for word in words:
+                for url, pairs in page_paths(service, word, src, dsts).items():
+                    async with session.get(url) as response:
+                        if response.status != 200:
+                            print(f"Skipping {url}: {response.status}")
+                            continue
+                        html = await response.text()
+                    for src_code, dst_code in pairs:
+                        path = folder / service.service_name
+                        path.mkdir(parents=True, exist_ok=True)
+                        path /= f"{src_code}_{dst_code}_{word}.html"
+                        path.write_text(html, encoding="utf-8")
+                        saved += 1
+                    # Be gentle with the sites, the recording is not timed.
+                    await asyncio.sleep(delay)
+    return saved
+
+
+MEANINGS = {
+    "kedi": {
+        "ru": ["кошка", "кот", "киска"],
+        "en": ["cat", "puss", "tomcat"],
+    },
+    "ev": {
+        "ru": ["дом", "жилище", "семья"],
+        "en": ["house", "home", "household"],
+    },
+    "kitap": {
+        "ru": ["книга", "том", "сочинение"],
+        "en": ["book", "volume", "tome"],
+    },
+}
+"Translations on the stand-in pages, other words get placeholders."
+CODES = {"english": "en", "turkish": "tr", "russian": "ru"}
+
+
+def meanings(word: str, dst_code: str) -> list[str]:
+    code = CODES.get(dst_code, dst_code)
+    return MEANINGS.get(word, {}).get(code, [f"{word}-{code}-{i}" for i in range(3)])
+
+
+def demek_ru(word: str, src_code: str, dst_code: str) -> str:
+    first, second, third = meanings(word, dst_code)
+    return (
+        f'<div class="item_bsc"><div class="word"><b>{word}</b></div>'
+        f'<div class="tr">{first}, {second}; <i>разг.</i> {third}</div></div>'
+    )
+
+
+def glosbe_com(word: str, src_code: str, dst_code: str) -> str:
+    first, second, third = meanings(word, dst_code)
+    return (
+        f'<p id="content-summary" class="text-gray-800">Translation of "{word}" '
+        f"into {dst_code}: <strong>{first}</strong>, {second}, {third}. "
+        "Sample translated sentence: ...</p>"
+    )
+
+
+def turkcesozluk_net(word: str, src_code: str, dst_code: str) -> str:
+    items = "".join(f"<li>{x}</li>" for x in meanings(word, dst_code))
+    return (
+        f'<table name="{src_code}{dst_code}" class="sozluk">'
+        f"<tr><th>{word}</th></tr><tr><td><table>"
+        f'<tr><td>1.</td><td><ul class="ulc">{items}</ul></td></tr>'
+        "</table></td></tr></table>"
+    )
+
+
+def tureng_com(word: str, src_code: str, dst_code: str) -> str:
+    title = f"{dst_code} {src_code} dictionary".title()
+    src, dst = CODES[src_code], CODES[dst_code]
+    rows = "".join(
+        f'<tr><td>{i}</td><td>Common Usage</td><td lang="{src}">{word}</td>'
+        f'<td lang="{dst}">{translation}</td></tr>'
+        for i, translation in enumerate(meanings(word, dst_code), 1)
+    )
+    return (
+        f'<h2>Meanings of "{word}" in {title} : 3 result(s)</h2>\n'
+        f'<table class="table searchResultsTable" id="englishResultsTable">{rows}'
+        "</table>"
+    )
+
+
+TEMPLATES: dict[str, Callable[[str, str, str], str]] = {
+    "demek.ru": demek_ru,
+    "glosbe.com": glosbe_com,
+    "turkcesozluk.net": turkcesozluk_net,
+    "tureng.com": tureng_com,
+}
+"Markup each service's extract reads, by service name."
+
+
+def padding(rng: random.Random, size: int) -> list[str]:
+    "Navigation links and article paragraphs of about size characters."
+    syllables = ["ka", "le", "mi", "to", "ru", "sa", "ne", "di", "yo", "be", "ti"]
+    parts: list[str] = []
+    length = 0
+    while length < size:
+        words = [
+            "".join(rng.choices(syllables, k=rng.randint(1, 4)))
+            for _ in range(rng.randint(8, 30))
+        ]
+        if rng.random() < 0.4:
+            part = (
+                "<ul class='nav'>"
+                + "".join(
+                    f"<li><a href='/{w}' class='link'>{w}</a></li>" for w in words
+                )
+                + "</ul>"
+            )
+        else:
+            part = f"<div class='article'><p>{' '.join(words)}.</p></div>"
+        parts.append(part)
+        length += len(part)
+    return parts
+
+
+def synthetic_page(target: str, size: int, rng: random.Random) -> str:
+    "The target after the first third of the padding, as on the real pages."
+    head = (
+        "<!DOCTYPE html><html><head><meta charset='utf-8'><title>Dictionary</title>"
+        f"<script>var config = {{{', '.join(f'k{i}: {i}' for i in range(200))}}};"
+        "</script><style>.nav li { display: inline; }</style></head><body>"
+    )
+    parts = padding(rng, size - len(head) - len(target))
+    third = len(parts) // 3
+    body = "".join(parts[:third]) + target + "".join(parts[third:])
+    return head + body + "</body></html>"
+
+
+def record_synthetic(
+    folder: Path, words: list[str], src: Language, dsts: list[Language], size: int
+) -> int:
+    "Saves stand-in pages and returns their number."
+    saved = 0
+    for service in Translator.services:
+        template = TEMPLATES.get(service.service_name)
+        if not isinstance(service, ScrapingService) or template is None:
+            continue
+        for word in words:
+            for pairs in page_paths(service, word, src, dsts).values():
+                rng = random.Random(f"{service.service_name} {word}")
+                targets = [template(word, *codes) for codes in pairs]
+                # A shared page holds the tables of all its languages.
+                html = synthetic_page("".join(targets), size, rng)
+                for src_code, dst_code in pairs:
+                    path = folder / service.service_name
+                    path.mkdir(parents=True, exist_ok=True)
+                    path /= f"{src_code}_{dst_code}_{word}.html"
+                    path.write_text(html, encoding="utf-8")
+                    saved += 1
+    return saved
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=Path, default=Path("benchmarks/pages"))
+    parser.add_argument("--words", nargs="+", default=["kedi"])
+    parser.add_argument("--source", default="turkish")
+    parser.add_argument("--targets", nargs="+", default=["russian", "english"])
+    parser.add_argument("--delay", type=float, default=1.0)
+    parser.add_argument("--synthetic", action="store_true")
+    parser.add_argument("--size", type=int, default=120, help="kilobytes")
+    args = parser.parse_args()
+
+    src = Language[args.source]
+    dsts = [Language[name] for name in args.targets]
+    if args.synthetic:
+        size = args.size * 1024
+        saved = record_synthetic(args.pages, args.words, src, dsts, size)
+    else:
+        saved = asyncio.run(record(args.pages, args.words, src, dsts, args.delay))
+    print(f"{saved} pages saved to {args.pages}")
+
+
+if __name__ == "__main__":
+    main()
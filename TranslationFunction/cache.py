@@ -0,0 +1,241 @@
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from configparser import ConfigParser
+from dataclasses import dataclass, field
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from typing import Any, Optional, TypeAlias
+
+
+CacheKey: TypeAlias = tuple[str, str, str, str]
+"(normalized text, src, dst, service name)"
+CacheValue: TypeAlias = Optional[dict[str, Any]]
+"Serialized translation unit or None for a remembered miss."
+
+
+@dataclass(slots=True)
+class CacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class MemoryTier:
+    "In-process LRU storage whose entries expire at a given time."
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.entries: OrderedDict[CacheKey, tuple[float, CacheValue]] = OrderedDict()
+
+    def get(self, key: CacheKey) -> tuple[bool, CacheValue]:
+        try:
+            expires, value = self.entries[key]
+        except KeyError:
+            return False, None
+        if expires < time.time():
+            del self.entries[key]
+            return False, None
+        self.entries.move_to_end(key)
+        return True, value
+
+    def put(self, key: CacheKey, value: CacheValue, expires: float) -> None:
+        self.entries[key] = (expires, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+
+class DiskTier:
+    "Persistent storage in a sqlite database, survives restarts of the instance."
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._connection: Optional[sqlite3.Connection] = None
+        self.pid = 0
+        self.lock = threading.Lock()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        "Opened on first use in the process, so it isn't carried across a fork."
+        if self._connection is None or self.pid != os.getpid():
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS translations "
+                "(key TEXT PRIMARY KEY, value TEXT, expires REAL)"
+            )
+            self._connection.commit()
+            self.pid = os.getpid()
+        return self._connection
+
+    @staticmethod
+    def _encode_key(key: CacheKey) -> str:
+        return "\x1f".join(key)
+
+    def get(self, key: CacheKey) -> tuple[bool, CacheValue, float]:
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT value, expires FROM translations WHERE key = ?",
+                (self._encode_key(key),),
+            ).fetchone()
+            if row is None:
+                return False, None, 0.0
+            value, expires = row
+            if expires < time.time():
+                self.connection.execute(
+                    "DELETE FROM translations WHERE key = ?", (self._encode_key(key),)
+                )
+                self.connection.commit()
+                return False, None, 0.0
+        return True, json.loads(value), expires
+
+    def contains(self, key: CacheKey) -> bool:
+        "Whether an unexpired entry is stored, expired ones are left for get."
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT 1 FROM translations WHERE key = ? AND expires >= ?",
+                (self._encode_key(key), time.time()),
+            ).fetchone()
+        return row is not None
+
+    def put(self, key: CacheKey, value: CacheValue, expires: float) -> None:
+        self.put_many([(key, value, expires)])
+
+    def put_many(self, entries: list[tuple[CacheKey, CacheValue, float]]) -> None:
+        "Writes the entries in a single transaction."
+        with self.lock:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO translations VALUES (?, ?, ?)",
+                [
+                    (self._encode_key(key), json.dumps(value), expires)
+                    for key, value, expires in entries
+                ],
+            )
+            self.connection.commit()
+
+
+@dataclass
+class TranslationCache:
+    """
+    Two-tier cache of results returned by translation services.
+    The first tier is an in-process LRU, the second one is an on-disk database.
+    Misses (a service returned nothing) are remembered too, but for a shorter time.
+
+    Coroutines use lookup and put_many, which leave the disk tier to a worker
+    thread, so the event loop never waits for sqlite.
+    """
+
+    memory: MemoryTier
+    disk: Optional[DiskTier] = None
+    ttl: float = 7 * 24 * 3600
+    negative_ttl: float = 3600
+    stats: CacheStats = field(default_factory=CacheStats)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    "Guards the memory tier and the stats, the disk tier has its own lock."
+    executor: ThreadPoolExecutor = field(
+        default_factory=lambda: ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="translation-cache"
+        )
+    )
+
+    @classmethod
+    def from_config(cls, path: str = "config.ini") -> "TranslationCache":
+        """
+        The disk tier starts as a copy of the seed database deployed with
+        the function (see prewarm.py) if it doesn't exist yet.
+        """
+        config = ConfigParser()
+        config.read(path)
+        section = config["TRANSLATION CACHE"]
+        disk_path = section.get("Disk path", "")
+        seed_path = section.get("Seed path", "")
+        if disk_path and seed_path and os.path.exists(seed_path):
+            if not os.path.exists(disk_path):
+                shutil.copyfile(seed_path, disk_path)
+                print(f"Translation cache is seeded from {seed_path}")
+        return cls(
+            memory=MemoryTier(section.getint("Memory size", 4096)),
+            disk=DiskTier(disk_path) if disk_path else None,
+            ttl=section.getfloat("TTL", 7 * 24 * 3600),
+            negative_ttl=section.getfloat("Negative TTL", 3600),
+        )
+
+    def get(self, key: CacheKey) -> tuple[bool, CacheValue]:
+        "Returns a pair (found, value). A found None value is a remembered miss."
+        with self.lock:
+            found, value = self.memory.get(key)
+            if found:
+                self.stats.memory_hits += 1
+                return True, value
+        expires = 0.0
+        if self.disk is not None:
+            found, value, expires = self.disk.get(key)
+        with self.lock:
+            if found:
+                self.memory.put(key, value, expires)
+                self.stats.disk_hits += 1
+            else:
+                self.stats.misses += 1
+        return found, value
+
+    async def lookup(self, key: CacheKey) -> tuple[bool, CacheValue]:
+        "Same as get, the disk tier is read on the worker thread."
+        with self.lock:
+            in_memory = key in self.memory.entries
+        if in_memory or self.disk is None:
+            return self.get(key)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.get, key)
+
+    def peek(self, key: CacheKey) -> bool:
+        "Whether the key is cached, without counting a hit or a miss or promoting it."
+        with self.lock:
+            entry = self.memory.entries.get(key)
+            if entry is not None and entry[0] >= time.time():
+                return True
+        return self.disk is not None and self.disk.contains(key)
+
+    def _expires(self, value: CacheValue) -> float:
+        ttl = self.ttl if value is not None else self.negative_ttl
+        return time.time() + ttl
+
+    def put(self, key: CacheKey, value: CacheValue) -> None:
+        expires = self._expires(value)
+        with self.lock:
+            self.memory.put(key, value, expires)
+        if self.disk is not None:
+            self.disk.put(key, value, expires)
+
+    def put_many(self, values: dict[CacheKey, CacheValue]) -> None:
+        """
+        Stores the values in memory at once and writes them to the disk tier
+        in a single transaction on the worker thread without waiting for it.
+        """
+        entries = [(key, value, self._expires(value)) for key, value in values.items()]
+        with self.lock:
+            for key, value, expires in entries:
+                self.memory.put(key, value, expires)
+        if self.disk is not None and entries:
+            self.executor.submit(self._write, self.disk, entries)
+
+    @staticmethod
+    def _write(
+        disk: DiskTier, entries: list[tuple[CacheKey, CacheValue, float]]
+    ) -> None:
+        try:
+            disk.put_many(entries)
+        except sqlite3.Error as e:
+            print(f"Translation cache write failed: {e!r}")
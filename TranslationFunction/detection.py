@@ -0,0 +1,247 @@
+"""
+Scored language detection.
+
+Languages are first narrowed down by the letters of the text, as detect_language
+does, and to the languages the caller translates from. Languages written with
+the same letters (Turkish, English and German typed in ASCII) are then scored:
+words of the lexicon by their frequencies in each language, other words by
+character trigram log-likelihoods. The scores are turned into confidences.
+Tables are precompiled offline and loaded into dicts once, so scoring a word
+takes a few dict lookups per character.
+
+File format: tab separated lines
+    #languages  language ...
+    #floor      log-probability of an unseen trigram per language
+    n  trigram  log-probability per language
+    w  word     log-probability per language, a smoothed one if the word
+                is missing in the language
+
+Build it from frequency lists of real text named after the language,
+e.g. `tr.txt`, with lines `word count`:
+    python detection.py detection.tsv lexicon/tr.txt lexicon/en.txt ...
+The lists in lexicon/ are fetched from wordfreq, see lexicon/README.md.
+Turkish is often typed in ASCII, so Turkish words are counted
+with their ASCII-folded forms as well.
+"""
+from argparse import ArgumentParser
+from collections.abc import Collection
+from configparser import ConfigParser
+import math
+import os
+from pathlib import Path
+from typing import Optional
+
+from diacritics import fold
+from fuzzy import read_frequency_list
+from languages import LANGUAGE_SYMBOLS, Language
+from local_dictionary import LANGUAGES_BY_CODE
+
+
+SMOOTHING = 0.5
+FOLDED_LANGUAGES = (Language.turkish,)
+"Languages whose words are counted typed in ASCII as well."
+
+
+def normalize(word: str) -> str:
+    return word.replace("İ", "i").lower()
+
+
+def trigrams(word: str) -> list[str]:
+    padded = f" {word} "
+    return [padded[i : i + 3] for i in range(len(padded) - 2)]
+
+
+class LanguageDetector:
+    "Confidences of the languages a text could be written in."
+
+    def __init__(
+        self,
+        languages: tuple[Language, ...] = (),
+        floor: tuple[float, ...] = (),
+        ngrams: Optional[dict[str, tuple[float, ...]]] = None,
+        lexicon: Optional[dict[str, tuple[float, ...]]] = None,
+    ) -> None:
+        self.languages = languages
+        self.floor = floor
+        self.ngrams = ngrams or {}
+        self.lexicon = lexicon or {}
+
+    @classmethod
+    def load(cls, path: str | Path) -> "LanguageDetector":
+        languages: tuple[Language, ...] = ()
+        floor: tuple[float, ...] = ()
+        ngrams: dict[str, tuple[float, ...]] = {}
+        lexicon: dict[str, tuple[float, ...]] = {}
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                kind, key, *values = line.rstrip("\n").split("\t")
+                if kind == "n":
+                    ngrams[key] = tuple(map(float, values))
+                elif kind == "w":
+                    lexicon[key] = tuple(map(float, values))
+                elif kind == "#languages":
+                    languages = tuple(Language[x] for x in [key, *values])
+                elif kind == "#floor":
+                    floor = tuple(map(float, [key, *values]))
+        print(
+            f"Language detector with {len(ngrams)} trigrams "
+            f"and {len(lexicon)} words is loaded"
+        )
+        return cls(languages, floor, ngrams, lexicon)
+
+    @classmethod
+    def from_config(cls, path: str = "config.ini") -> "LanguageDetector":
+        "Falls back to the letters of the text only if no tables are configured."
+        config = ConfigParser()
+        config.read(path)
+        tables_path = config["DETECTION"].get("Path", "")
+        if not tables_path or not os.path.exists(tables_path):
+            return cls()
+        return cls.load(tables_path)
+
+    def candidates(
+        self, text: str, languages: Optional[Collection[Language]] = None
+    ) -> list[Language]:
+        """
+        Languages written with all the letters of the text, the preferred first.
+        If languages are given, only they are considered.
+        """
+        letters = {c for c in text if c.isalpha()}
+        if not letters:
+            return []
+        return [
+            language
+            for language, symbols in LANGUAGE_SYMBOLS.items()
+            if letters <= symbols and (languages is None or language in languages)
+        ]
+
+    def scores(
+        self, text: str, languages: Optional[Collection[Language]] = None
+    ) -> list[tuple[Language, float]]:
+        """
+        Returns the candidate languages with their confidences summing up to 1,
+        the most likely first. Without tables all the candidates are equally likely.
+        """
+        candidates = self.candidates(text, languages)
+        modelled = [x for x in self.languages if x in candidates]
+        if len(modelled) < 2:
+            return [(x, 1 / len(candidates)) for x in candidates]
+
+        likelihood = [0.0] * len(self.languages)
+        for word in normalize(text).split():
+            word = "".join(c for c in word if c.isalpha())
+            scores = self.lexicon.get(word)
+            if scores is not None:
+                likelihood = [a + b for a, b in zip(likelihood, scores)]
+                continue
+            for trigram in trigrams(word):
+                scores = self.ngrams.get(trigram, self.floor)
+                likelihood = [a + b for a, b in zip(likelihood, scores)]
+
+        by_language = {
+            language: likelihood[i]
+            for i, language in enumerate(self.languages)
+            if language in modelled
+        }
+        best = max(by_language.values())
+        weights = {x: math.exp(v - best) for x, v in by_language.items()}
+        total = sum(weights.values())
+        ranked = sorted(
+            ((x, w / total) for x, w in weights.items()),
+            key=lambda item: -item[1],
+        )
+        # Candidates the tables know nothing about are left as a last resort.
+        return ranked + [(x, 0.0) for x in candidates if x not in by_language]
+
+    def detect(
+        self, text: str, languages: Optional[Collection[Language]] = None
+    ) -> Optional[Language]:
+        scores = self.scores(text, languages)
+        return scores[0][0] if scores else None
+
+
+def read_word_counts(word_list: Path) -> tuple[Language, dict[str, float]]:
+    "Counts of the words of a list, folded forms included for FOLDED_LANGUAGES."
+    if word_list.stem not in LANGUAGES_BY_CODE:
+        raise ValueError(f"{word_list.name} should be named after a language")
+    language = LANGUAGES_BY_CODE[word_list.stem]
+    counts: dict[str, float] = {}
+    for text, count in read_frequency_list(word_list):
+        for word in normalize(text).split():
+            forms = {word, fold(word)} if language in FOLDED_LANGUAGES else {word}
+            for form in forms:
+                counts[form] = counts.get(form, 0) + count
+    return language, counts
+
+
+def build_tables(path: Path, word_lists: list[Path], lexicon_size: int) -> int:
+    """
+    Writes the tables and returns the number of trigrams.
+    Trigrams are counted once per distinct word, so frequent short words
+    don't dominate them; the lexicon keeps the lexicon_size most frequent words
+    of each list with their frequencies.
+    """
+    counts: dict[Language, dict[str, float]] = {}
+    for word_list in word_lists:
+        language, word_counts = read_word_counts(word_list)
+        counts[language] = word_counts
+    languages = list(counts)
+
+    ngram_counts: dict[Language, dict[str, int]] = {x: {} for x in languages}
+    for language, word_counts in counts.items():
+        for word in word_counts:
+            for trigram in trigrams(word):
+                language_counts = ngram_counts[language]
+                language_counts[trigram] = language_counts.get(trigram, 0) + 1
+    vocabulary = set().union(*ngram_counts.values())
+    ngram_totals = [
+        sum(ngram_counts[x].values()) + SMOOTHING * len(vocabulary) for x in languages
+    ]
+
+    lexicon = set()
+    for word_counts in counts.values():
+        ranked = sorted(word_counts, key=word_counts.__getitem__, reverse=True)
+        lexicon.update(ranked[:lexicon_size])
+    word_totals = [sum(counts[x].values()) for x in languages]
+    # A word missing in a list gets half the count of the rarest word of the list.
+    unknown = [
+        math.log(SMOOTHING * min(counts[x].values()) / total)
+        for x, total in zip(languages, word_totals)
+    ]
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\t".join(["#languages", *(x.name for x in languages)]) + "\n")
+        floor = [math.log(SMOOTHING / total) for total in ngram_totals]
+        f.write("\t".join(["#floor", *(f"{x:.3f}" for x in floor)]) + "\n")
+        for trigram in sorted(vocabulary):
+            scores = [
+                math.log((ngram_counts[x].get(trigram, 0) + SMOOTHING) / total)
+                for x, total in zip(languages, ngram_totals)
+            ]
+            f.write("\t".join(["n", trigram, *(f"{x:.3f}" for x in scores)]) + "\n")
+        for word in sorted(lexicon):
+            scores = [
+                math.log(counts[x][word] / total) if word in counts[x] else default
+                for x, total, default in zip(languages, word_totals, unknown)
+            ]
+            f.write("\t".join(["w", word, *(f"{x:.3f}" for x in scores)]) + "\n")
+    return len(vocabulary)
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Builds the language detection tables.")
+    parser.add_argument("output", type=Path)
+    parser.add_argument("word_lists", type=Path, nargs="+")
+    parser.add_argument(
+        "--lexicon-size",
+        type=int,
+        default=10000,
+        help="number of the most frequent words of each list kept in the lexicon",
+    )
+    args = parser.parse_args()
+    count = build_tables(args.output, args.word_lists, args.lexicon_size)
+    print(f"{count} trigrams written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Fuzzy lookup of misspelled words, SymSpell style.
+
+Every word of a frequency list is stored under all the strings obtained by
+deleting up to max_distance characters from its prefix, so the candidates for
+a misspelled word are found by generating its own deletions and looking them up,
+without scanning the vocabulary. Candidates are verified with the
+Damerau-Levenshtein distance and ranked by distance, then by frequency.
+
+The index is a MappedIndex (see local_dictionary.py) with records
+`code:deletion \\t word \\t count \\n ...` and a `#settings` record.
+
+Build it from frequency lists named after the language, e.g. `tr.txt`,
+with lines `word [count]` ranked by frequency:
+    python fuzzy.py fuzzy.idx tr.txt ru.txt en.txt --max-distance 2
+"""
+from argparse import ArgumentParser
+from itertools import chain
+from pathlib import Path
+from typing import Iterator
+
+from languages import ISO_639_codes, Language, lowercase
+from local_dictionary import LANGUAGES_BY_CODE, MappedIndex
+
+
+SETTINGS_KEY = "#settings"
+
+
+def deletions(word: str, max_distance: int, prefix_length: int) -> set[str]:
+    "All strings obtained by deleting up to max_distance characters of the prefix."
+    result = {word[:prefix_length]}
+    edge = set(result)
+    for _ in range(max_distance):
+        edge = {w[:i] + w[i + 1 :] for w in edge for i in range(len(w))}
+        result |= edge
+    return result
+
+
+def damerau_levenshtein(a: str, b: str, max_distance: int) -> int:
+    """
+    Optimal string alignment distance between a and b,
+    any value above max_distance is returned as max_distance + 1.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    before_previous: list[int] = []
+    row = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        previous_row, current_row = row, [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current_row[j] = min(
+                previous_row[j] + 1,
+                current_row[j - 1] + 1,
+                previous_row[j - 1] + cost,
+            )
+            if (
+                i > 1
+                and j > 1
+                and a[i - 1] == b[j - 2]
+                and a[i - 2] == b[j - 1]
+                and before_previous[j - 2] + 1 < current_row[j]
+            ):
+                current_row[j] = before_previous[j - 2] + 1
+        if min(current_row) > max_distance and min(previous_row) > max_distance:
+            return max_distance + 1
+        before_previous, row = previous_row, current_row
+    return min(row[-1], max_distance + 1)
+
+
+class FuzzyIndex:
+    "Candidates for misspelled words from a memory-mapped deletion index."
+
+    def __init__(self, path: str | Path) -> None:
+        self.index = MappedIndex(path)
+        settings = self.index.get(SETTINGS_KEY) or "2\t7"
+        max_distance, prefix_length = settings.split("\t")
+        self.max_distance = int(max_distance)
+        self.prefix_length = int(prefix_length)
+
+    def candidates(self, text: str, language: Language, limit: int = 3) -> list[str]:
+        """
+        Returns up to limit known words of the language closest to the text,
+        the closest and most frequent first. The text itself is not included.
+        """
+        code = ISO_639_codes[language]
+        word = " ".join(lowercase(text, language).split())
+        found: dict[str, tuple[int, int]] = {}
+        for deletion in deletions(word, self.max_distance, self.prefix_length):
+            value = self.index.get(f"{code}:{deletion}")
+            if value is None:
+                continue
+            for line in value.splitlines():
+                candidate, count = line.split("\t")
+                if candidate == word or candidate in found:
+                    continue
+                distance = damerau_levenshtein(word, candidate, self.max_distance)
+                if distance <= self.max_distance:
+                    found[candidate] = (distance, -int(count))
+        return sorted(found, key=found.__getitem__)[:limit]
+
+
+def read_frequency_list(path: Path) -> Iterator[tuple[str, int]]:
+    """
+    Reads lines `word [count]` ranked by frequency.
+    Words without a count get one decreasing with the rank.
+    """
+    with open(path, encoding="utf-8") as f:
+        lines = [line.split() for line in f if line.strip()]
+    for rank, parts in enumerate(lines):
+        if len(parts) > 1 and parts[-1].isdigit():
+            yield " ".join(parts[:-1]), int(parts[-1])
+        else:
+            yield " ".join(parts), len(lines) - rank
+
+
+def build_fuzzy_index(
+    path: Path, word_lists: list[Path], max_distance: int, prefix_length: int
+) -> int:
+    entries: dict[str, dict[str, int]] = {}
+    for word_list in word_lists:
+        code = word_list.stem
+        if code not in LANGUAGES_BY_CODE:
+            raise ValueError(f"{word_list.name} should be named after a language")
+        language = LANGUAGES_BY_CODE[code]
+        for word, count in read_frequency_list(word_list):
+            word = lowercase(word, language)
+            for deletion in deletions(word, max_distance, prefix_length):
+                words = entries.setdefault(f"{code}:{deletion}", {})
+                words[word] = max(words.get(word, 0), count)
+    records = (
+        (key, "\n".join(f"{w}\t{c}" for w, c in words.items()))
+        for key, words in entries.items()
+    )
+    settings = [(SETTINGS_KEY, f"{max_distance}\t{prefix_length}")]
+    return MappedIndex.build(path, chain(settings, records))
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Builds the fuzzy lookup index.")
+    parser.add_argument("output", type=Path)
+    parser.add_argument("word_lists", type=Path, nargs="+")
+    parser.add_argument("--max-distance", type=int, default=2)
+    parser.add_argument("--prefix-length", type=int, default=7)
+    args = parser.parse_args()
+    count = build_fuzzy_index(
+        args.output, args.word_lists, args.max_distance, args.prefix_length
+    )
+    print(f"{count} entries written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+from collections import deque
+from configparser import ConfigParser
+from dataclasses import dataclass, field
+from enum import Enum
+import threading
+import time
+from typing import Any
+
+
+class BreakerState(str, Enum):
+    closed = "closed"
+    "The service is healthy and called as usual."
+    open = "open"
+    "The service is skipped until the cool-down period is over."
+    half_open = "half-open"
+    "A single probe call decides whether the service is back."
+
+
+@dataclass(slots=True)
+class BreakerSettings:
+    window: int = 20
+    "Number of recent calls the failure rate is computed over."
+    min_calls: int = 5
+    "The breaker doesn't open before the window has this many calls."
+    failure_threshold: float = 0.5
+    "Share of failed calls in the window which opens the breaker."
+    cool_down: float = 60
+    "Seconds an open breaker waits before letting a probe call through."
+
+    @classmethod
+    def from_config(cls, path: str = "config.ini") -> "BreakerSettings":
+        config = ConfigParser()
+        config.read(path)
+        section = config["CIRCUIT BREAKER"]
+        return cls(
+            window=section.getint("Window", 20),
+            min_calls=section.getint("Min calls", 5),
+            failure_threshold=section.getfloat("Failure threshold", 0.5),
+            cool_down=section.getfloat("Cool down", 60),
+        )
+
+
+class CircuitBreaker:
+    """
+    Tracks recent failures and latency of a translation service.
+    Opens when too many recent calls have failed, so the service is skipped
+    for the cool-down period, after which a single probe call is let through.
+    """
+
+    def __init__(self, settings: BreakerSettings) -> None:
+        self.settings = settings
+        self.state = BreakerState.closed
+        self.outcomes: deque[bool] = deque(maxlen=settings.window)
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.latency = 0.0
+        self.calls = 0
+        self.failures = 0
+        self.skipped = 0
+        self.lock = threading.Lock()
+
+    def allow(self) -> bool:
+        "Whether the service should be called now."
+        with self.lock:
+            match self.state:
+                case BreakerState.closed:
+                    return True
+                case BreakerState.open:
+                    if time.time() - self.opened_at < self.settings.cool_down:
+                        self.skipped += 1
+                        return False
+                    self.state = BreakerState.half_open
+                    self.probe_in_flight = True
+                    return True
+                case _:
+                    if self.probe_in_flight:
+                        self.skipped += 1
+                        return False
+                    self.probe_in_flight = True
+                    return True
+
+    def release_probe(self) -> None:
+        "Lets another probe through if the call allowed by the breaker wasn't made."
+        with self.lock:
+            self.probe_in_flight = False
+
+    def record(self, success: bool, latency: float) -> None:
+        with self.lock:
+            self.calls += 1
+            self.failures += not success
+            if self.calls == 1:
+                self.latency = latency
+            else:
+                self.latency = 0.8 * self.latency + 0.2 * latency
+            self.outcomes.append(success)
+            if self.state == BreakerState.half_open:
+                self.probe_in_flight = False
+                if success:
+                    self.state = BreakerState.closed
+                    self.outcomes.clear()
+                else:
+                    self._open()
+            elif self.state == BreakerState.closed and self._failure_rate_exceeded():
+                self._open()
+
+    def _failure_rate_exceeded(self) -> bool:
+        if len(self.outcomes) < self.settings.min_calls:
+            return False
+        failure_rate = self.outcomes.count(False) / len(self.outcomes)
+        return failure_rate >= self.settings.failure_threshold
+
+    def _open(self) -> None:
+        self.state = BreakerState.open
+        self.opened_at = time.time()
+
+    def status(self) -> dict[str, Any]:
+        with self.lock:
+            recent = len(self.outcomes)
+            return {
+                "state": self.state.value,
+                "recent failure rate": (
+                    self.outcomes.count(False) / recent if recent else 0.0
+                ),
+                "latency": self.latency,
+                "calls": self.calls,
+                "failures": self.failures,
+                "skipped": self.skipped,
+            }
+
+
+@dataclass
+class ServiceHealth:
+    "Circuit breakers of all the translation services, created on first use."
+
+    settings: BreakerSettings = field(default_factory=BreakerSettings)
+    breakers: dict[str, CircuitBreaker] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def breaker(self, service_name: str) -> CircuitBreaker:
+        with self.lock:
+            if service_name not in self.breakers:
+                self.breakers[service_name] = CircuitBreaker(self.settings)
+            return self.breakers[service_name]
+
+    def status(self) -> dict[str, dict[str, Any]]:
+        with self.lock:
+            breakers = dict(self.breakers)
+        return {name: breaker.status() for name, breaker in breakers.items()}
@@ -0,0 +1,233 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from configparser import ConfigParser
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from importlib.util import find_spec
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Mapping, Optional, TypeVar
+
+# aiohttp decodes brotli only if the package is installed.
+ACCEPT_ENCODING = "br, gzip, deflate" if find_spec("brotli") else "gzip, deflate"
+
+T = TypeVar("T")
+
+
+@dataclass(slots=True)
+class CachedResponse:
+    body: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    expires: float
+
+    @property
+    def fresh(self) -> bool:
+        return self.expires > time.time()
+
+    def validators(self) -> dict[str, str]:
+        "Headers of a conditional request revalidating the response."
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def _parse_date(value: Optional[str]) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def freshness_lifetime(headers: Mapping[str, str]) -> Optional[float]:
+    """
+    Seconds the response stays fresh according to its headers,
+    None if it must not be stored at all.
+    """
+    directives = {}
+    for directive in headers.get("Cache-Control", "").split(","):
+        name, _, value = directive.strip().partition("=")
+        directives[name.lower()] = value.strip('"')
+    if "no-store" in directives or "private" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0.0
+    for name in ("s-maxage", "max-age"):
+        if directives.get(name, "").isdigit():
+            return float(directives[name])
+    expires = _parse_date(headers.get("Expires"))
+    if expires is not None:
+        return max(0.0, expires - time.time())
+    # Heuristic freshness: a tenth of the time since the last modification.
+    last_modified = _parse_date(headers.get("Last-Modified"))
+    if last_modified is not None:
+        return max(0.0, (time.time() - last_modified) / 10)
+    return 0.0
+
+
+class HTTPCache:
+    """
+    Size-bounded on-disk cache of upstream pages keyed by URL,
+    pages read only up to a stream target are keyed by the URL and the target.
+    Follows Cache-Control/Expires of the responses, stale responses with
+    an ETag or Last-Modified are revalidated with a conditional request.
+    The least recently used responses are evicted when the size limit is exceeded.
+
+    The database is only touched from a single worker thread, so the event loop
+    never waits for sqlite. Access times of lookups are kept in memory and written
+    with the next store, the total size is tracked in memory, so evicting takes
+    an indexed query for the oldest responses instead of a full scan.
+    """
+
+    evict_batch = 16
+    "Number of the least recently used responses fetched per eviction query."
+
+    def __init__(self, path: str, max_size: int) -> None:
+        self.max_size = max_size
+        self.executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="http-cache"
+        )
+        self.path = path
+        self._connection: Optional[sqlite3.Connection] = None
+        self.pid = 0
+        self.total_size = 0
+        self.accessed: dict[str, float] = {}
+        "Access times of lookups not written to the database yet."
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+
+    @classmethod
+    def from_config(cls, path: str = "config.ini") -> Optional["HTTPCache"]:
+        "Returns None if the cache is not configured."
+        config = ConfigParser()
+        config.read(path)
+        section = config["HTTP CACHE"]
+        cache_path = section.get("Path", "")
+        if not cache_path:
+            return None
+        max_size = int(section.getfloat("Max size MB", 32) * 2**20)
+        return cls(cache_path, max_size)
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """
+        Opened on first use in the process rather than on import,
+        so a connection is never carried across a fork into a worker.
+        """
+        if self._connection is None or self.pid != os.getpid():
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses (url TEXT PRIMARY KEY, "
+                "body TEXT, etag TEXT, last_modified TEXT, expires REAL, "
+                "accessed REAL, size INTEGER)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)"
+            )
+            connection.commit()
+            (self.total_size,) = connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            self._connection = connection
+            self.pid = os.getpid()
+        return self._connection
+
+    async def _run(self, call: Callable[..., T], *args: Any) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, call, *args)
+
+    async def lookup(self, url: str) -> Optional[CachedResponse]:
+        return await self._run(self.lookup_sync, url)
+
+    async def store(self, url: str, body: str, headers: Mapping[str, str]) -> None:
+        await self._run(self.store_sync, url, body, headers)
+
+    async def revalidated(self, url: str, headers: Mapping[str, str]) -> None:
+        "Refreshes the stored response after the upstream answered 304 Not Modified."
+        await self._run(self.revalidated_sync, url, headers)
+
+    def lookup_sync(self, url: str) -> Optional[CachedResponse]:
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT body, etag, last_modified, expires "
+                "FROM responses WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.accessed[url] = time.time()
+            response = CachedResponse(*row)
+            if response.fresh:
+                self.hits += 1
+        return response
+
+    def store_sync(self, url: str, body: str, headers: Mapping[str, str]) -> None:
+        lifetime = freshness_lifetime(headers)
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if lifetime is None:
+            return
+        if lifetime <= 0 and etag is None and last_modified is None:
+            return
+        size = len(body.encode())
+        if size > self.max_size:
+            return
+        now = time.time()
+        with self.lock:
+            self._flush_access_times()
+            row = self.connection.execute(
+                "SELECT size FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+            self.connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, body, etag, last_modified, now + lifetime, now, size),
+            )
+            self.total_size += size - (row[0] if row is not None else 0)
+            self._evict()
+            self.connection.commit()
+
+    def revalidated_sync(self, url: str, headers: Mapping[str, str]) -> None:
+        lifetime = freshness_lifetime(headers) or 0.0
+        with self.lock:
+            self.revalidations += 1
+            self.accessed.pop(url, None)
+            self.connection.execute(
+                "UPDATE responses SET expires = ?, accessed = ? WHERE url = ?",
+                (time.time() + lifetime, time.time(), url),
+            )
+            self.connection.commit()
+
+    def _flush_access_times(self) -> None:
+        self.connection.executemany(
+            "UPDATE responses SET accessed = ? WHERE url = ?",
+            [(accessed, url) for url, accessed in self.accessed.items()],
+        )
+        self.accessed.clear()
+
+    def _evict(self) -> None:
+        while self.total_size > self.max_size:
+            rows = self.connection.execute(
+                "SELECT url, size FROM responses ORDER BY accessed LIMIT ?",
+                (self.evict_batch,),
+            ).fetchall()
+            if not rows:
+                self.total_size = 0
+                return
+            evicted = []
+            for url, size in rows:
+                if self.total_size <= self.max_size:
+                    break
+                evicted.append((url,))
+                self.accessed.pop(url, None)
+                self.total_size -= size
+            self.connection.executemany("DELETE FROM responses WHERE url = ?", evicted)
@@ -12,30 +12,71 @@ RUSSIAN_SYMBOLS = (
     set("аАбБвВгГдДеЕёЁжЖзЗиИйЙкКлЛмМнНоОпПрРсСтТуУфФхХцЦчЧшШщЩъЪыЫьЬэЭюЮяЯ")
     | PUNCTUATION_SYMBOLS
 )
+GERMAN_SYMBOLS = ENGLISH_SYMBOLS | set("äÄöÖüÜß")
+AZERBAIJANI_SYMBOLS = (TURKISH_SYMBOLS | set("əƏqQxX")) - set("âÂ")
 
 
 class Language(str, Enum):
     russian = "russian"
     turkish = "turkish"
     english = "english"
+    german = "german"
+    azerbaijani = "azerbaijani"
+
+
+LANGUAGE_SYMBOLS: dict[Language, set[str]] = {
+    Language.turkish: TURKISH_SYMBOLS,
+    Language.russian: RUSSIAN_SYMBOLS,
+    Language.english: ENGLISH_SYMBOLS,
+    Language.german: GERMAN_SYMBOLS,
+    Language.azerbaijani: AZERBAIJANI_SYMBOLS,
+}
+"Symbols each language is written with, in the order of preference."
+
+
+DETECTED_BY_SYMBOLS = (Language.turkish, Language.russian, Language.english)
+"""
+German and Azerbaijani are written with the letters of English and Turkish
+but a few, so only LanguageDetector (see detection.py) tells them apart.
+"""
 
 
 def detect_language(text: str) -> Optional[Language]:
     "Detects language using set of symbols"
     symbols = set(text)
-    if symbols < TURKISH_SYMBOLS:
-        return Language.turkish
-    if symbols < RUSSIAN_SYMBOLS:
-        return Language.russian
-    if symbols < ENGLISH_SYMBOLS:
-        return Language.english
+    for language in DETECTED_BY_SYMBOLS:
+        if symbols < LANGUAGE_SYMBOLS[language]:
+            return language
     return None
 
 
+TURKISH_UPPER_TO_LOWER = {
+    "Ç": "ç",
+    "Ğ": "ğ",
+    "I": "ı",
+    "İ": "i",
+    "Ö": "ö",
+    "Ş": "ş",
+    "Ü": "ü",
+}
+
+
+def lowercase(text: str, language: Optional[Language]) -> str:
+    match language:
+        case Language.turkish | Language.azerbaijani:
+            for k, v in TURKISH_UPPER_TO_LOWER.items():
+                text = text.replace(k, v)
+            return text.lower()
+        case _:
+            return text.lower()
+
+
 ISO_639_codes: dict[Language, str] = {
     Language.turkish: "tr",
     Language.russian: "ru",
     Language.english: "en",
+    Language.german: "de",
+    Language.azerbaijani: "az",
 }
 
 
@@ -43,10 +84,14 @@ genitive_cases: dict[Language, str] = {
     Language.turkish: "турецкого",
     Language.russian: "русского",
     Language.english: "английского",
+    Language.german: "немецкого",
+    Language.azerbaijani: "азербайджанского",
 }
 
 lang_to_flag: dict[Language, str] = {
     Language.russian: emojize(":Russia:"),
     Language.turkish: emojize(":Turkey:"),
     Language.english: emojize(":United_Kingdom:"),
+    Language.german: emojize(":Germany:"),
+    Language.azerbaijani: emojize(":Azerbaijan:"),
 }
@@ -0,0 +1,34 @@
+"""
+Exports the frequency lists detection.tsv is built from out of wordfreq,
+see README.md. The lists are CC BY-SA 4.0, so they are not committed.
+
+Requires `pip install wordfreq`. Run from the TranslationFunction folder:
+    python lexicon/fetch.py lexicon tr en de
+"""
+from argparse import ArgumentParser
+from pathlib import Path
+
+from wordfreq import top_n_list, word_frequency  # type: ignore
+
+
+def export(folder: Path, language: str, size: int) -> Path:
+    "Writes lines `word count`, counts are per billion words."
+    path = folder / f"{language}.txt"
+    with open(path, "w", encoding="utf-8") as f:
+        for word in top_n_list(language, size):
+            f.write(f"{word} {round(word_frequency(word, language) * 1e9)}\n")
+    return path
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("folder", type=Path)
+    parser.add_argument("languages", nargs="+", help="ISO 639-1 codes")
+    parser.add_argument("--size", type=int, default=30000)
+    args = parser.parse_args()
+    for language in args.languages:
+        print(f"{export(args.folder, language, args.size)} is written")
+
+
+if __name__ == "__main__":
+    main()
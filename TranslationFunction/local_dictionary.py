@@ -0,0 +1,145 @@
+"""
+Compact on-disk dictionary used by the LocalDictionary translation service.
+
+The index is a single file of sorted key-value records, memory-mapped on load,
+so opening it is instant and its pages are shared between instances on the host.
+Lookups are binary searches over a table of record offsets.
+
+File layout (little-endian):
+    MAGIC | uint32 count | uint32 offsets[count + 1] | records
+where each record is `key \\t value` in utf-8 and records are sorted by key bytes.
+
+Build it from TSV word lists named after a language pair, e.g. `tr-ru.tsv`,
+with rows `word \\t translation`:
+    python local_dictionary.py dictionary.idx tr-ru.tsv ru-tr.tsv en-tr.tsv
+"""
+from argparse import ArgumentParser
+import csv
+import mmap
+from pathlib import Path
+import struct
+from typing import Iterable, Iterator, Optional
+
+from languages import ISO_639_codes, lowercase
+
+
+MAGIC = b"PTBIDX1\n"
+UINT32 = struct.Struct("<I")
+
+
+class MappedIndex:
+    "Sorted key-value records in a memory-mapped file, looked up by binary search."
+
+    def __init__(self, path: str | Path) -> None:
+        with open(path, "rb") as f:
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.buffer[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not an index file")
+        (self.count,) = UINT32.unpack_from(self.buffer, len(MAGIC))
+        self.offsets_start = len(MAGIC) + UINT32.size
+        self.records_start = self.offsets_start + (self.count + 1) * UINT32.size
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _offset(self, i: int) -> int:
+        position = self.offsets_start + i * UINT32.size
+        (offset,) = UINT32.unpack_from(self.buffer, position)
+        return self.records_start + offset
+
+    def _record(self, i: int) -> tuple[bytes, bytes]:
+        record = self.buffer[self._offset(i) : self._offset(i + 1)]
+        key, _, value = record.partition(b"\t")
+        return key, value
+
+    def _key(self, i: int) -> bytes:
+        start = self._offset(i)
+        end = self.buffer.find(b"\t", start, self._offset(i + 1))
+        return self.buffer[start:end]
+
+    def _lower_bound(self, key: bytes) -> int:
+        "Index of the first record whose key is not less than the given one."
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def get(self, key: str) -> Optional[str]:
+        encoded = key.encode()
+        i = self._lower_bound(encoded)
+        if i == self.count:
+            return None
+        found, value = self._record(i)
+        if found != encoded:
+            return None
+        return value.decode()
+
+    @staticmethod
+    def build(path: str | Path, items: Iterable[tuple[str, str]]) -> int:
+        "Writes the records into an index file and returns their number."
+        records = sorted(
+            (key.encode(), value.encode()) for key, value in items if "\t" not in key
+        )
+        offsets = [0]
+        for key, value in records:
+            offsets.append(offsets[-1] + len(key) + 1 + len(value))
+        with open(path, "wb") as f:
+            f.write(MAGIC)
+            f.write(UINT32.pack(len(records)))
+            for offset in offsets:
+                f.write(UINT32.pack(offset))
+            for key, value in records:
+                f.write(key + b"\t" + value)
+        return len(records)
+
+
+LANGUAGES_BY_CODE = {code: language for language, code in ISO_639_codes.items()}
+
+
+def dictionary_key(src_language_code: str, dst_language_code: str, text: str) -> str:
+    "Key of a word in the local dictionary, the word is lowercased and stripped."
+    language = LANGUAGES_BY_CODE.get(src_language_code)
+    word = " ".join(lowercase(text, language).split())
+    return f"{src_language_code}-{dst_language_code}:{word}"
+
+
+def read_word_list(path: Path) -> Iterator[tuple[str, str]]:
+    "Reads a TSV word list named after its language pair, e.g. tr-ru.tsv."
+    src, dst = path.stem.split("-")[:2]
+    if src not in LANGUAGES_BY_CODE or dst not in LANGUAGES_BY_CODE:
+        raise ValueError(f"{path.name} should be named after a language pair")
+    with open(path, encoding="utf-8", newline="") as f:
+        for row in csv.reader(f, delimiter="\t", quoting=csv.QUOTE_NONE):
+            if len(row) < 2 or not row[0].strip() or not row[1].strip():
+                continue
+            yield dictionary_key(src, dst, row[0]), row[1].strip()
+
+
+def build_dictionary(path: Path, word_lists: list[Path]) -> int:
+    "Merges the word lists, translations of the same word are joined by '; '."
+    entries: dict[str, list[str]] = {}
+    for word_list in word_lists:
+        for key, translation in read_word_list(word_list):
+            translations = entries.setdefault(key, [])
+            if translation not in translations:
+                translations.append(translation)
+    return MappedIndex.build(
+        path, ((key, "; ".join(values)) for key, values in entries.items())
+    )
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Builds the local dictionary index.")
+    parser.add_argument("output", type=Path)
+    parser.add_argument("word_lists", type=Path, nargs="+")
+    args = parser.parse_args()
+    count = build_dictionary(args.output, args.word_lists)
+    print(f"{count} entries written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,97 @@
+import atexit
 from dataclasses import asdict
 from typing import Any
 import functions_framework  # type: ignore
-from flask import Request
-from translation import Translator, get_translation
+from flask import Request, abort
+from ratelimit import host_limiters
+from translation import (
+    GoogleTranslate,
+    ScrapingService,
+    Translator,
+    get_translation,
+    get_translations,
+)
 from router import RequestRouter
 
 
-translator = Translator()
+translator = Translator.from_config()
+atexit.register(translator.close)
 app = RequestRouter()
 
 
 @app.route("/", "POST")
 def translate(data: dict[str, Any]) -> dict:
     text = data["text"]
-    return asdict(get_translation(translator, text))
+    try:
+        deadline = translator.parse_soft_deadline(data.get("deadline"))
+    except ValueError as e:
+        abort(400, str(e))
+    return asdict(get_translation(translator, text, deadline))
+
+
+@app.route("/batch", "POST")
+def translate_batch(data: dict[str, Any]) -> list[dict]:
+    try:
+        texts = translator.parse_batch(data.get("texts"))
+    except ValueError as e:
+        abort(400, str(e))
+    return [asdict(t) for t in get_translations(translator, texts)]
 
 
 @app.route("/", "GET")
 def status(_: dict[str, Any]) -> str:
-    return """<title>TranslationFunction</title>
+    page = """<title>TranslationFunction</title>
     <H1>The function is online.</H1>"""
+    if translator.cache is not None:
+        stats = translator.cache.stats
+        page += f"""
+    <p>Cache: {stats.memory_hits} memory hits, {stats.disk_hits} disk hits,
+    {stats.misses} misses ({stats.hit_rate:.1%} hit rate).</p>"""
+    http_cache = ScrapingService.http_cache
+    if http_cache is not None:
+        page += f"""
+    <p>HTTP cache: {http_cache.hits} fresh hits, {http_cache.revalidations}
+    revalidated, {http_cache.misses} misses.</p>"""
+    for service in translator.services:
+        if isinstance(service, GoogleTranslate):
+            batcher = service.batcher
+            page += f"""
+    <p>Google Translate: {batcher.values} values in {batcher.requests} requests.</p>"""
+    rows = "".join(
+        f"<tr><td>{name}</td><td>{s['state']}</td>"
+        f"<td>{s['recent failure rate']:.0%}</td><td>{s['latency']:.2f}s</td>"
+        f"<td>{s['calls']}</td><td>{s['failures']}</td><td>{s['skipped']}</td></tr>"
+        for name, s in translator.health.status().items()
+    )
+    page += f"""
+    <table>
+    <tr><th>Service</th><th>Circuit</th><th>Recent failures</th><th>Latency</th>
+    <th>Calls</th><th>Failures</th><th>Skipped</th></tr>{rows}
+    </table>"""
+    rows = "".join(
+        f"<tr><td>{host}</td><td>{s['requests']}</td><td>{s['shed']}</td>"
+        f"<td>{s['active']}</td><td>{s['queued']}</td>"
+        f"<td>{s['mean queue time']:.3f}s</td><td>{s['max queue time']:.3f}s</td></tr>"
+        for host, s in host_limiters.status().items()
+    )
+    page += f"""
+    <table>
+    <tr><th>Host</th><th>Requests</th><th>Shed</th><th>Active</th><th>Queued</th>
+    <th>Mean queue time</th><th>Max queue time</th></tr>{rows}
+    </table>"""
+    if translator.selection is not None:
+        rows = "".join(
+            f"<tr><td>{' '.join(key)}</td><td>{s['hit rate']:.0%}</td>"
+            f"<td>{s['latency']:.2f}s</td><td>{s['calls']}</td><td>{s['skipped']}</td>"
+            "</tr>"
+            for key, s in translator.selection.status().items()
+        )
+        page += f"""
+    <table>
+    <tr><th>Service, languages, words</th><th>Hit rate</th><th>Latency</th>
+    <th>Calls</th><th>Skipped</th></tr>{rows}
+    </table>"""
+    return page
 
 
 @functions_framework.http
@@ -0,0 +1,46 @@
+from configparser import ConfigParser
+from dataclasses import dataclass
+from enum import Enum
+from importlib.util import find_spec
+from typing import Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+
+LXML_AVAILABLE = find_spec("lxml") is not None
+
+
+class ParsingBackend(str, Enum):
+    full = "full"
+    "html.parser building the tree of the whole page."
+    strainer = "strainer"
+    "html.parser building only the subtree the service extracts its translation from."
+    lxml = "lxml"
+    "lxml building only the target subtree; falls back to strainer if not installed."
+
+
+@dataclass
+class SoupParser:
+    """
+    Builds soups of dictionary pages with the configured backend.
+    Services pass a SoupStrainer describing their target subtree,
+    every backend has to produce an identical result for it.
+    """
+
+    backend: ParsingBackend = ParsingBackend.strainer
+
+    @classmethod
+    def from_config(cls, path: str = "config.ini") -> "SoupParser":
+        config = ConfigParser()
+        config.read(path)
+        backend = config["PARSING"]["Backend"]
+        return cls(ParsingBackend(backend))
+
+    def parse(self, html: str, target: Optional[SoupStrainer] = None) -> BeautifulSoup:
+        match self.backend:
+            case ParsingBackend.full:
+                return BeautifulSoup(html, "html.parser")
+            case ParsingBackend.lxml if LXML_AVAILABLE:
+                return BeautifulSoup(html, "lxml", parse_only=target)
+            case _:
+                return BeautifulSoup(html, "html.parser", parse_only=target)
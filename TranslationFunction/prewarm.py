@@ -0,0 +1,142 @@
+"""
+Fills the seed of the translation cache with the most frequent words
+before traffic arrives.
+
+Takes frequency-ranked word lists (one word per line, optionally followed by
+its count), translates the top N words of each list through Translator.translate
+and reports which share of the recent queries would have been served from the cache.
+Words are translated one at a time with a pause in between, so the scraped
+sites are not flooded; words which are already cached are not requested again.
+
+Results are written to the seed database ([TRANSLATION CACHE] Seed path) in the
+function folder instead of the disk tier, which lives in the instance's /tmp.
+The seed is deployed with the function and copied to the disk tier
+when an instance starts, so deploy the function after prewarming.
+
+Run from the TranslationFunction folder:
+    python prewarm.py tr.txt ru.txt en.txt --top 1000 --queries recent.txt
+    ./deploy.ps1
+"""
+from argparse import ArgumentParser
+from configparser import ConfigParser
+from pathlib import Path
+import time
+from typing import Iterator, Optional
+
+from cache import DiskTier
+from languages import detect_language, lowercase
+from translation import Translator
+
+
+def read_frequency_list(path: Path, top: int) -> Iterator[str]:
+    "Yields the first top words of a list ranked by frequency."
+    count = 0
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if count >= top:
+                return
+            word = line.split("\t")[0].strip()
+            head, _, tail = word.rpartition(" ")
+            if head and tail.isdigit():
+                word = head.strip()
+            if not word or detect_language(word) is None:
+                continue
+            count += 1
+            yield word
+
+
+def read_queries(path: Path) -> list[str]:
+    "Reads recent queries, one per line."
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def prewarm(translator: Translator, words: list[str], interval: float) -> int:
+    "Translates the words which are not cached yet and returns their number."
+    translated = 0
+    for i, word in enumerate(words, 1):
+        if translator.is_cached(word):
+            continue
+        start = time.monotonic()
+        translator.translate(word)
+        translated += 1
+        if i % 100 == 0:
+            print(f"{i}/{len(words)} words are warmed")
+        time.sleep(max(0.0, interval - (time.monotonic() - start)))
+    return translated
+
+
+def coverage(translator: Translator, queries: list[str]) -> tuple[float, float]:
+    """
+    Returns shares of the queries and of the distinct queries
+    which would have been served from the cache.
+    """
+    cached: dict[str, bool] = {}
+    hits = 0
+    for query in queries:
+        src = translator.detect(query)
+        key = lowercase(query, src) if src is not None else query
+        if key not in cached:
+            cached[key] = translator.is_cached(query)
+        hits += cached[key]
+    if not queries:
+        return 0.0, 0.0
+    return hits / len(queries), sum(cached.values()) / len(cached)
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Fills the translation cache.")
+    parser.add_argument("word_lists", type=Path, nargs="+")
+    parser.add_argument("--top", type=int, default=1000)
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=1.0,
+        help="minimal time in seconds between two translated words",
+    )
+    parser.add_argument("--queries", type=Path, default=None)
+    parser.add_argument("--config", default="config.ini")
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="seed database to fill, [TRANSLATION CACHE] Seed path by default",
+    )
+    args = parser.parse_args()
+
+    config = ConfigParser()
+    config.read(args.config)
+    output = args.output or config["TRANSLATION CACHE"].get("Seed path", "")
+    if not output:
+        raise SystemExit("The seed of the translation cache is not configured")
+    translator = Translator.from_config(args.config)
+    if translator.cache is None:
+        raise SystemExit("The translation cache is not configured")
+    translator.cache.disk = DiskTier(str(output))
+    print(f"Warming {output}")
+    words: list[str] = []
+    for word_list in args.word_lists:
+        words.extend(read_frequency_list(word_list, args.top))
+    queries: Optional[list[str]] = None
+    if args.queries is not None:
+        queries = read_queries(args.queries)
+        before, _ = coverage(translator, queries)
+        print(f"Coverage of {len(queries)} recent queries before: {before:.1%}")
+
+    start = time.monotonic()
+    translated = prewarm(translator, words, args.interval)
+    print(
+        f"{translated} of {len(words)} words translated "
+        f"in {time.monotonic() - start:.0f}s, the rest were cached already"
+    )
+    if queries is not None:
+        after, distinct = coverage(translator, queries)
+        print(
+            f"Coverage of {len(queries)} recent queries after: {after:.1%} "
+            f"({distinct:.1%} of distinct queries)"
+        )
+    translator.close()
+
+
+if __name__ == "__main__":
+    main()
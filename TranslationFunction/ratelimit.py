@@ -0,0 +1,192 @@
+import asyncio
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass
+import math
+import threading
+import time
+from typing import Any, Optional
+
+
+class LoadShed(Exception):
+    "Raised when a request would wait in the host queue longer than allowed."
+
+
+@dataclass(frozen=True, slots=True)
+class HostLimits:
+    rate: float = 5.0
+    "Requests per second sustained by the token bucket."
+    burst: int = 5
+    "Size of the token bucket."
+    max_concurrency: int = 4
+    "Requests to the host in flight at the same time."
+    max_queue_time: Optional[float] = None
+    "Requests of callers without a deadline are shed after waiting this long."
+
+
+request_deadline: ContextVar[Optional[float]] = ContextVar(
+    "request_deadline", default=None
+)
+"Monotonic time the caller waits for the answer until, see HostLimiter.acquire."
+
+
+class HostLimiter:
+    """
+    Token bucket and concurrency cap of a single upstream host.
+    State is guarded by a thread lock, so the limiter is shared by requests
+    running on different event loops. Waiters sleep until the next token is due
+    or, if the host is at its concurrency cap, until a released slot wakes them.
+    """
+
+    def __init__(self, host: str, limits: HostLimits) -> None:
+        self.host = host
+        self.limits = limits
+        self.tokens = float(limits.burst)
+        self.refilled_at = time.monotonic()
+        self.active = 0
+        self.queued = 0
+        self.requests = 0
+        self.shed = 0
+        self.total_queue_time = 0.0
+        self.max_queue_time = 0.0
+        self.waiters: deque[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+        "Waiters for a free slot, each one is woken on its own loop."
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self.refilled_at
+        self.tokens = min(self.limits.burst, self.tokens + elapsed * self.limits.rate)
+        self.refilled_at = now
+
+    def _try_acquire(
+        self, start: float, waiter: tuple[asyncio.AbstractEventLoop, asyncio.Future]
+    ) -> Optional[float]:
+        """
+        Takes a token and a slot and returns None, otherwise returns how long
+        to wait for the next token or infinity if the waiter waits for a slot.
+        """
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            if self.active >= self.limits.max_concurrency:
+                self.waiters.append(waiter)
+                return math.inf
+            if self.tokens < 1:
+                return (1 - self.tokens) / self.limits.rate
+            self.tokens -= 1
+            self.active += 1
+            self.requests += 1
+            queue_time = now - start
+            self.total_queue_time += queue_time
+            self.max_queue_time = max(self.max_queue_time, queue_time)
+            return None
+
+    def _wake_next(self) -> None:
+        "Wakes the first waiter for a slot if one is free, the lock must be held."
+        if self.waiters and self.active < self.limits.max_concurrency:
+            loop, woken = self.waiters.popleft()
+            loop.call_soon_threadsafe(self._wake, woken)
+
+    @staticmethod
+    def _wake(woken: asyncio.Future) -> None:
+        if not woken.done():
+            woken.set_result(None)
+
+    def _shed(self) -> None:
+        with self.lock:
+            self.shed += 1
+        raise LoadShed(f"{self.host}: request is shed, it can't start in time")
+
+    async def acquire(self, deadline: Optional[float] = None) -> None:
+        """
+        Waits for a token and a free slot until the deadline (monotonic time).
+        Requests which can't start by the deadline are shed as soon as that
+        is known. Without a deadline requests queue for as long as it takes,
+        unless the host limits set max_queue_time.
+        """
+        start = time.monotonic()
+        if deadline is None:
+            max_queue_time = self.limits.max_queue_time
+            deadline = math.inf if max_queue_time is None else start + max_queue_time
+        with self.lock:
+            self._refill(start)
+            expected_wait = (self.queued + 1 - self.tokens) / self.limits.rate
+            too_late = start + expected_wait > deadline
+            if not too_late:
+                self.queued += 1
+        if too_late:
+            self._shed()
+        loop = asyncio.get_running_loop()
+        acquired = False
+        try:
+            while True:
+                waiter = (loop, loop.create_future())
+                wait = self._try_acquire(start, waiter)
+                if wait is None:
+                    acquired = True
+                    return
+                try:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or remaining < wait < math.inf:
+                        self._shed()
+                    timeout = min(wait, remaining)
+                    await asyncio.wait(
+                        [waiter[1]], timeout=timeout if timeout < math.inf else None
+                    )
+                finally:
+                    with self.lock:
+                        if waiter in self.waiters:
+                            self.waiters.remove(waiter)
+        finally:
+            with self.lock:
+                self.queued -= 1
+                if not acquired:
+                    # The slot this waiter may have been woken for goes to the next.
+                    self._wake_next()
+
+    def release(self) -> None:
+        with self.lock:
+            self.active -= 1
+            self._wake_next()
+
+    async def __aenter__(self) -> "HostLimiter":
+        await self.acquire(request_deadline.get())
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        self.release()
+
+    def status(self) -> dict[str, Any]:
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "shed": self.shed,
+                "active": self.active,
+                "queued": self.queued,
+                "mean queue time": (
+                    self.total_queue_time / self.requests if self.requests else 0.0
+                ),
+                "max queue time": self.max_queue_time,
+            }
+
+
+class HostLimiters:
+    "Registry of limiters, one per upstream host."
+
+    def __init__(self) -> None:
+        self.limiters: dict[str, HostLimiter] = {}
+        self.lock = threading.Lock()
+
+    def get(self, host: str, limits: HostLimits) -> HostLimiter:
+        with self.lock:
+            if host not in self.limiters:
+                self.limiters[host] = HostLimiter(host, limits)
+            return self.limiters[host]
+
+    def status(self) -> dict[str, dict[str, Any]]:
+        with self.lock:
+            limiters = dict(self.limiters)
+        return {host: limiter.status() for host, limiter in limiters.items()}
+
+
+host_limiters = HostLimiters()
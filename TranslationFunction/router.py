@@ -42,5 +42,5 @@ class RequestRouter:
             print(f"Dispatch error: {path, method}")
             return abort(404)
         print(f"Calling {f.__name__} function")
-        data = json.loads(request.data)
+        data = json.loads(request.data) if request.data else {}
         return jsonify(f(data))
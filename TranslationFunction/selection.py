@@ -0,0 +1,87 @@
+from configparser import ConfigParser
+from dataclasses import dataclass, field
+import random
+import threading
+from typing import Any, TypeAlias
+
+
+SelectionKey: TypeAlias = tuple[str, str, str, str]
+"(service name, src, dst, input shape)"
+
+
+def input_shape(text: str) -> str:
+    "Buckets the text by its number of words."
+    words = len(text.split())
+    return str(words) if words < 3 else "3+"
+
+
+@dataclass(slots=True)
+class CallStats:
+    calls: int = 0
+    skipped: int = 0
+    hit_rate: float = 1.0
+    "Exponentially weighted share of calls which returned a translation."
+    latency: float = 0.0
+    "Exponentially weighted latency of the calls in seconds."
+
+
+@dataclass
+class AdaptiveSelection:
+    """
+    Keeps running hit rate and latency of every service per language pair
+    and input shape, and skips calls which are very unlikely to succeed.
+    A small share of such calls is still made, so the statistics can recover.
+    """
+
+    min_samples: int = 20
+    "Calls are never skipped before this many calls have been made."
+    min_hit_rate: float = 0.05
+    "Calls are skipped if the hit rate is below this value."
+    exploration_rate: float = 0.1
+    "Share of calls made even though the hit rate is too low."
+    decay: float = 0.05
+    "Weight of the latest call in the running averages."
+    stats: dict[SelectionKey, CallStats] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    @classmethod
+    def from_config(cls, path: str = "config.ini") -> "AdaptiveSelection":
+        config = ConfigParser()
+        config.read(path)
+        section = config["ADAPTIVE SELECTION"]
+        return cls(
+            min_samples=section.getint("Min samples", 20),
+            min_hit_rate=section.getfloat("Min hit rate", 0.05),
+            exploration_rate=section.getfloat("Exploration rate", 0.1),
+            decay=section.getfloat("Decay", 0.05),
+        )
+
+    def should_call(self, key: SelectionKey) -> bool:
+        with self.lock:
+            stats = self.stats.setdefault(key, CallStats())
+            if stats.calls < self.min_samples or stats.hit_rate >= self.min_hit_rate:
+                return True
+            if random.random() < self.exploration_rate:
+                return True
+            stats.skipped += 1
+            return False
+
+    def record(self, key: SelectionKey, hit: bool, latency: float) -> None:
+        with self.lock:
+            stats = self.stats.setdefault(key, CallStats())
+            stats.calls += 1
+            weight = max(self.decay, 1 / stats.calls)
+            stats.hit_rate += weight * (hit - stats.hit_rate)
+            stats.latency += weight * (latency - stats.latency)
+
+    def status(self) -> dict[SelectionKey, dict[str, Any]]:
+        with self.lock:
+            return {
+                key: {
+                    "calls": stats.calls,
+                    "skipped": stats.skipped,
+                    "hit rate": stats.hit_rate,
+                    "latency": stats.latency,
+                }
+                for key, stats in sorted(self.stats.items())
+            }
@@ -0,0 +1,113 @@
+import codecs
+from configparser import ConfigParser
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from typing import Optional
+
+from aiohttp import ClientResponse  # type: ignore
+
+
+def streaming_enabled(path: str = "config.ini") -> bool:
+    config = ConfigParser()
+    config.read(path)
+    return config["PARSING"].getboolean("Streaming", True)
+
+
+@dataclass(frozen=True, slots=True)
+class StreamTarget:
+    """
+    Elements of a page a service needs: the first <tag> whose attribute
+    has (or, for class, contains) each of the values.
+    """
+
+    tag: str
+    attribute: str
+    values: tuple[str, ...]
+
+    @property
+    def key(self) -> str:
+        "Identifies the target in cache keys of pages read up to it."
+        return f"{self.tag}[{self.attribute}={'|'.join(self.values)}]"
+
+    def match(self, tag: str, attrs: list[tuple[str, Optional[str]]]) -> Optional[str]:
+        "Returns the value the start tag matches, if any."
+        if tag != self.tag:
+            return None
+        for name, value in attrs:
+            if name != self.attribute or value is None:
+                continue
+            found = value.split() if name == "class" else [value]
+            for candidate in self.values:
+                if candidate in found:
+                    return candidate
+        return None
+
+
+class TargetWatcher(HTMLParser):
+    """
+    Incrementally parses the beginning of a page and tells
+    when all the target elements have been closed,
+    so the rest of the page does not need to be downloaded.
+    """
+
+    def __init__(self, target: StreamTarget) -> None:
+        super().__init__(convert_charrefs=False)
+        self.target = target
+        self.remaining = set(target.values)
+        self.current: Optional[str] = None
+        "Value of the target element being read."
+        self.depth = 0
+        "Number of open target tags inside the current element, itself included."
+
+    @property
+    def done(self) -> bool:
+        return not self.remaining
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, Optional[str]]]) -> None:
+        if self.current is not None:
+            if tag == self.target.tag:
+                self.depth += 1
+            return
+        value = self.target.match(tag, attrs)
+        if value in self.remaining:
+            self.current = value
+            self.depth = 1
+
+    def handle_startendtag(
+        self, tag: str, attrs: list[tuple[str, Optional[str]]]
+    ) -> None:
+        "Self-closing tags never contain anything and don't change the depth."
+
+    def handle_endtag(self, tag: str) -> None:
+        if self.current is None or tag != self.target.tag:
+            return
+        self.depth -= 1
+        if self.depth == 0:
+            self.remaining.discard(self.current)
+            self.current = None
+
+
+async def read_until_target(
+    response: ClientResponse, target: StreamTarget, chunk_size: int = 16384
+) -> tuple[str, bool]:
+    """
+    Reads the body in chunks until all the target elements are closed
+    and closes the connection then.
+    Returns the text read and whether it is the complete body.
+    """
+    encoding = response.charset or "utf-8"
+    try:
+        decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    except LookupError:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    watcher = TargetWatcher(target)
+    parts = []
+    async for chunk in response.content.iter_chunked(chunk_size):
+        text = decoder.decode(chunk)
+        parts.append(text)
+        watcher.feed(text)
+        if watcher.done:
+            response.close()
+            return "".join(parts), False
+    parts.append(decoder.decode(b"", final=True))
+    return "".join(parts), True
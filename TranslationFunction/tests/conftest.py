@@ -0,0 +1,44 @@
+"""
+Modules of the function are imported as top-level modules, as they are deployed.
+
+translation.py reads config.ini and the Google credentials at import time,
+so the tests run in a temporary folder with a copy of the config which points
+to a generated service account key and keeps all the caches in memory.
+"""
+from configparser import ConfigParser
+import json
+import os
+from pathlib import Path
+import sys
+import tempfile
+
+import rsa  # type: ignore
+
+
+FUNCTION_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(FUNCTION_DIR))
+
+
+def write_config(folder: Path) -> None:
+    _, private_key = rsa.newkeys(512)
+    key = {
+        "type": "service_account",
+        "client_email": "tests@example.iam.gserviceaccount.com",
+        "token_uri": "https://oauth2.googleapis.com/token",
+        "private_key": private_key.save_pkcs1().decode(),
+    }
+    (folder / "gcloud_key.json").write_text(json.dumps(key))
+
+    config = ConfigParser()
+    config.read(FUNCTION_DIR / "config.ini")
+    config["GOOGLE TRANSLATE"]["Key path"] = str(folder / "gcloud_key.json")
+    config["TRANSLATION CACHE"]["Disk path"] = ""
+    config["HTTP CACHE"]["Path"] = ""
+    config["DETECTION"]["Path"] = str(FUNCTION_DIR / "detection.tsv")
+    with open(folder / "config.ini", "w", encoding="utf-8") as f:
+        config.write(f)
+
+
+test_folder = Path(tempfile.mkdtemp(prefix="translation-function-tests-"))
+write_config(test_folder)
+os.chdir(test_folder)
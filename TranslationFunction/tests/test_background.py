@@ -0,0 +1,44 @@
+import os
+
+from aiohttp import ClientSession  # type: ignore
+
+from background import BackgroundLoop
+from translation import Translator
+
+
+async def open_session(translator: Translator) -> ClientSession:
+    return translator.sessions.get("example.com")
+
+
+def test_close_closes_the_sessions_and_stops_the_loop() -> None:
+    translator = Translator()
+    session = translator.loop.run(open_session(translator))
+    translator.close()
+    assert session.closed
+    assert not translator.loop.running
+    assert translator.loop.loop.is_closed()
+    translator.close()
+
+
+async def answer() -> int:
+    return 42
+
+
+def test_the_loop_is_started_on_first_use_and_again_after_a_fork() -> None:
+    loop = BackgroundLoop()
+    assert not loop.running
+    assert loop.run(answer()) == 42
+    read, write = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        # Like a gunicorn worker forked after the module has been imported.
+        try:
+            os.write(write, str(loop.run(answer(), timeout=5)).encode())
+        finally:
+            os._exit(0)
+    os.close(write)
+    os.waitpid(pid, 0)
+    assert os.read(read, 8) == b"42"
+    os.close(read)
+    assert loop.running
+    loop.stop()
@@ -0,0 +1,23 @@
+from flask import Flask, request
+import pytest
+from werkzeug.exceptions import BadRequest
+
+import main
+from translation import Translator
+
+
+@pytest.mark.parametrize("texts", [None, "kedi", ["kedi", 1], ["kedi"] * 3])
+def test_invalid_batches_are_bad_requests(
+    texts: object, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(main.translator, "max_batch_size", 2)
+    with Flask(__name__).test_request_context(
+        "/batch", method="POST", json={"texts": texts}
+    ):
+        with pytest.raises(BadRequest):
+            main.TranslationFunction(request)
+
+
+def test_batches_are_lists_of_strings() -> None:
+    assert Translator().parse_batch(["kedi", "ev"]) == ["kedi", "ev"]
+    assert Translator().parse_batch([]) == []
@@ -0,0 +1,108 @@
+import asyncio
+from pathlib import Path
+from typing import Optional
+
+from aiohttp import ClientSession  # type: ignore
+
+from cache import CacheStats, DiskTier, MemoryTier, TranslationCache
+from languages import Language
+from translation import TranslationService, Translator, UpstreamError
+
+
+KEY = ("kedi", "turkish", "russian", "glosbe.com")
+UNIT = {"text": "кошка", "service_name": "glosbe.com", "url": "https://glosbe.com"}
+
+
+def disk_cache(path: Path, memory_size: int = 16) -> TranslationCache:
+    return TranslationCache(MemoryTier(memory_size), DiskTier(str(path)))
+
+
+def test_values_and_misses_round_trip(tmp_path: Path) -> None:
+    cache = disk_cache(tmp_path / "cache.sqlite3")
+    cache.put(KEY, UNIT)
+    cache.put(("kedy", *KEY[1:]), None)
+    assert cache.get(KEY) == (True, UNIT)
+    assert cache.get(("kedy", *KEY[1:])) == (True, None)
+    assert cache.get(("ev", *KEY[1:])) == (False, None)
+
+
+def test_disk_tier_survives_restarts(tmp_path: Path) -> None:
+    disk_cache(tmp_path / "cache.sqlite3").put(KEY, UNIT)
+    cache = disk_cache(tmp_path / "cache.sqlite3")
+    assert cache.get(KEY) == (True, UNIT)
+    assert cache.stats == CacheStats(disk_hits=1)
+    assert cache.get(KEY) == (True, UNIT)
+    assert cache.stats == CacheStats(memory_hits=1, disk_hits=1)
+
+
+def test_expired_entries_are_not_found(tmp_path: Path) -> None:
+    cache = disk_cache(tmp_path / "cache.sqlite3")
+    cache.ttl = -1
+    cache.put(KEY, UNIT)
+    assert not cache.peek(KEY)
+    assert cache.get(KEY) == (False, None)
+
+
+def test_peek_leaves_stats_alone(tmp_path: Path) -> None:
+    cache = disk_cache(tmp_path / "cache.sqlite3")
+    cache.put(KEY, UNIT)
+    assert cache.peek(KEY)
+    assert not cache.peek(("ev", *KEY[1:]))
+    assert cache.stats == CacheStats()
+    cache.memory.entries.clear()
+    assert cache.peek(KEY)
+    assert not cache.memory.entries
+
+
+def test_disk_tier_is_seeded_from_the_deployed_database(tmp_path: Path) -> None:
+    disk_cache(tmp_path / "seed.sqlite3").put(KEY, UNIT)
+    config = tmp_path / "config.ini"
+    config.write_text(
+        "[TRANSLATION CACHE]\n"
+        f"Disk path: {tmp_path / 'instance.sqlite3'}\n"
+        f"Seed path: {tmp_path / 'seed.sqlite3'}\n"
+    )
+    cache = TranslationCache.from_config(str(config))
+    assert cache.get(KEY) == (True, UNIT)
+    cache.put(("ev", *KEY[1:]), None)
+    assert not disk_cache(tmp_path / "seed.sqlite3").peek(("ev", *KEY[1:]))
+
+
+def test_lookup_reads_the_disk_tier_off_the_loop(tmp_path: Path) -> None:
+    cache = disk_cache(tmp_path / "cache.sqlite3")
+    cache.put_many({KEY: UNIT, ("kedy", *KEY[1:]): None})
+    cache.executor.submit(lambda: None).result()
+    restarted = disk_cache(tmp_path / "cache.sqlite3")
+    assert asyncio.run(restarted.lookup(KEY)) == (True, UNIT)
+    assert asyncio.run(restarted.lookup(("kedy", *KEY[1:]))) == (True, None)
+    assert asyncio.run(restarted.lookup(("ev", *KEY[1:]))) == (False, None)
+    assert restarted.stats == CacheStats(disk_hits=2, misses=1)
+
+
+class Blocked(TranslationService):
+    "Fails like a scraper given an error page, e.g. a captcha."
+
+    @property
+    def service_name(self) -> str:
+        return "blocked"
+
+    async def translate(
+        self,
+        text: str,
+        src_language_code: str,
+        dst_language_code: str,
+        session: ClientSession,
+    ) -> Optional[tuple[str, str]]:
+        raise UpstreamError("https://example.com responded with 403")
+
+
+def test_failed_calls_are_not_remembered_as_misses(tmp_path: Path) -> None:
+    translator = Translator(cache=disk_cache(tmp_path / "cache.sqlite3"))
+    units, failed = asyncio.run(
+        translator._cached_translate(  # pylint: disable=protected-access
+            Blocked(), "kedi", Language.turkish, [Language.russian], None
+        )
+    )
+    assert units == {Language.russian: None}
+    assert failed == {Language.russian}
+    assert not translator.cache.peek(("kedi", "turkish", "russian", "blocked"))
@@ -0,0 +1,30 @@
+from flask import Flask, request
+import pytest
+from werkzeug.exceptions import BadRequest
+
+import main
+from translation import Translator
+
+
+@pytest.mark.parametrize(
+    "value, seconds",
+    [(None, None), (0, 0.0), (1.5, 1.5), ("0.5", 0.5), (" 2 ", 2.0), (60, 10.0)],
+)
+def test_deadlines_are_parsed_and_capped(value: object, seconds: float) -> None:
+    translator = Translator(max_soft_deadline=10.0)
+    assert translator.parse_soft_deadline(value) == seconds
+
+
+@pytest.mark.parametrize("value", [-1, "-0.5", "soon", "nan", True, [1], {}])
+def test_invalid_deadlines_are_rejected(value: object) -> None:
+    with pytest.raises(ValueError):
+        Translator().parse_soft_deadline(value)
+
+
+@pytest.mark.parametrize("deadline", ["soon", -1])
+def test_invalid_deadlines_are_bad_requests(deadline: object) -> None:
+    with Flask(__name__).test_request_context(
+        "/", method="POST", json={"text": "kedi", "deadline": deadline}
+    ):
+        with pytest.raises(BadRequest):
+            main.TranslationFunction(request)
@@ -0,0 +1,122 @@
+from pathlib import Path
+
+import pytest
+
+from conftest import FUNCTION_DIR
+from detection import LanguageDetector
+from diacritics import DiacriticsIndex, build_diacritics_index
+from fuzzy import FuzzyIndex, build_fuzzy_index
+from languages import Language, detect_language
+from translation import Translator
+
+
+SERVED = [Language.russian, Language.turkish, Language.english]
+COMMON_TURKISH = [
+    "gel",
+    "su",
+    "git",
+    "ev",
+    "abla",
+    "kedi",
+    "merhaba",
+    "teşekkürler",
+    "şişli",
+    "sisli",
+    "nasılsın",
+    "nasilsin",
+    "gorusuruz",
+    "kopek",
+    "iyi geceler",
+]
+COMMON_ENGLISH = ["hello", "the house", "water", "good morning", "thank you"]
+
+
+@pytest.fixture(scope="module")
+def detector() -> LanguageDetector:
+    return LanguageDetector.load(FUNCTION_DIR / "detection.tsv")
+
+
+@pytest.mark.parametrize("text", COMMON_TURKISH)
+def test_common_turkish_words_stay_turkish(
+    detector: LanguageDetector, text: str
+) -> None:
+    assert detector.detect(text, SERVED) == Language.turkish
+
+
+@pytest.mark.parametrize("text", COMMON_ENGLISH)
+def test_common_english_words_are_english(
+    detector: LanguageDetector, text: str
+) -> None:
+    assert detector.detect(text, SERVED) == Language.english
+
+
+def test_only_given_languages_are_candidates(detector: LanguageDetector) -> None:
+    assert detector.candidates("gel", SERVED) == [Language.turkish, Language.english]
+    assert Language.german in detector.candidates("gel")
+    assert detector.candidates("привет", SERVED) == [Language.russian]
+
+
+def test_german_and_azerbaijani_are_left_to_the_detector(
+    detector: LanguageDetector,
+) -> None:
+    assert detect_language("kedi") == Language.turkish
+    assert detect_language("Mädchen") is None
+    assert detect_language("qəhvə") is None
+    assert detector.candidates("Mädchen") == [Language.german]
+    assert detector.candidates("qəhvə") == [Language.azerbaijani]
+
+
+def test_confidences_sum_up_to_one(detector: LanguageDetector) -> None:
+    scores = detector.scores("kitap", SERVED)
+    assert sum(confidence for _, confidence in scores) == pytest.approx(1)
+    assert scores[0][0] == Language.turkish
+
+
+def test_without_tables_candidates_are_equally_likely() -> None:
+    scores = LanguageDetector().scores("gel", SERVED)
+    assert scores == [(Language.turkish, 0.5), (Language.english, 0.5)]
+
+
+@pytest.mark.parametrize("text", ["gel", "su", "sisli", "nasilsin"])
+def test_translator_translates_common_turkish_words_from_turkish(
+    detector: LanguageDetector, text: str
+) -> None:
+    translator = Translator(target_languages=SERVED, detector=detector)
+    assert translator.sources(text) == [Language.turkish]
+
+
+def test_translator_ignores_languages_it_is_not_configured_for(
+    detector: LanguageDetector,
+) -> None:
+    translator = Translator(target_languages=SERVED, detector=detector)
+    assert translator.sources("Straße") == []
+
+
+def test_translator_restores_turkish_letters_whenever_turkish_is_a_candidate(
+    detector: LanguageDetector, tmp_path: Path
+) -> None:
+    word_list = tmp_path / "tr.txt"
+    word_list.write_text("görüşürüz 10\nşişli 5\nüs 3\n", encoding="utf-8")
+    build_diacritics_index(tmp_path / "diacritics.tsv", word_list)
+    translator = Translator(
+        target_languages=SERVED,
+        detector=detector,
+        diacritics=DiacriticsIndex(tmp_path / "diacritics.tsv"),
+    )
+    assert translator.detect("us") == Language.english
+    assert translator.restore("us") == "üs"
+    assert translator.restore("gorusuruz") == "görüşürüz"
+    assert translator.restore("sisli") == "şişli"
+    assert translator.restore("hello") == "hello"
+    assert translator.restore("привет") == "привет"
+
+
+def test_fuzzy_candidates_are_looked_up_in_the_given_language(tmp_path: Path) -> None:
+    (tmp_path / "tr.txt").write_text("kedi 10\n", encoding="utf-8")
+    (tmp_path / "en.txt").write_text("kid 10\n", encoding="utf-8")
+    build_fuzzy_index(
+        tmp_path / "fuzzy.idx", [tmp_path / "tr.txt", tmp_path / "en.txt"], 2, 7
+    )
+    index = FuzzyIndex(tmp_path / "fuzzy.idx")
+    assert index.candidates("kedy", Language.turkish) == ["kedi"]
+    assert index.candidates("kedy", Language.english) == ["kid"]
@@ -0,0 +1,57 @@
+from pathlib import Path
+
+import pytest
+
+from conftest import FUNCTION_DIR
+from diacritics import DiacriticsIndex, build_diacritics_index
+
+TURKISH_WORDS = FUNCTION_DIR / "lexicon" / "tr.txt"
+
+
+@pytest.fixture
+def index(tmp_path: Path) -> DiacriticsIndex:
+    word_list = tmp_path / "tr.txt"
+    word_list.write_text(
+        "görüşürüz 10\nsis 8\nşiş 2\nışık 5\niyi 4\ngorusuruz 1\n", encoding="utf-8"
+    )
+    build_diacritics_index(tmp_path / "diacritics.tsv", word_list)
+    return DiacriticsIndex(tmp_path / "diacritics.tsv")
+
+
+def test_turkish_letters_are_restored(index: DiacriticsIndex) -> None:
+    assert index.restore("gorusuruz, iyi") == "görüşürüz, iyi"
+    assert index.restore("isik") == "ışık"
+
+
+def test_case_is_preserved(index: DiacriticsIndex) -> None:
+    assert index.restore("Gorusuruz") == "Görüşürüz"
+    assert index.restore("GORUSURUZ ISIK") == "GÖRÜŞÜRÜZ IŞIK"
+    assert index.restore("Isik") == "Işık"
+
+
+def test_words_mostly_written_in_ascii_are_kept(index: DiacriticsIndex) -> None:
+    assert index.restore("sis") == "sis"
+    assert index.restore("Sis") == "Sis"
+    assert index.restore("hello") == "hello"
+    assert index.restore("şiş") == "şiş"
+
+
+@pytest.mark.skipif(
+    not TURKISH_WORDS.exists(), reason="fetch lexicon/tr.txt, see lexicon/README.md"
+)
+def test_ascii_spellings_of_the_lexicon_are_restored(tmp_path: Path) -> None:
+    build_diacritics_index(tmp_path / "diacritics.tsv", TURKISH_WORDS)
+    index = DiacriticsIndex(tmp_path / "diacritics.tsv")
+    assert index.restore("sisli cok guzel kucuk buyuk cocuk") == (
+        "şişli çok güzel küçük büyük çocuk"
+    )
+    assert index.restore("sis") == "sis"
+
+
+def test_copies_of_the_module_are_identical() -> None:
+    functions = Path(__file__).resolve().parents[2]
+    copies = [
+        functions / f"{name}Function" / "diacritics.py"
+        for name in ("Translation", "Morphology")
+    ]
+    assert copies[0].read_bytes() == copies[1].read_bytes()
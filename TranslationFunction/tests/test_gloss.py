@@ -0,0 +1,36 @@
+from languages import Language
+from translation import (
+    Gloss,
+    TranslationsToManyLanguages,
+    TranslationsToTheSameLanguage,
+    TranslationUnit,
+    Translator,
+    render_gloss,
+    short_gloss,
+)
+
+
+def to_russian(*units: TranslationUnit) -> TranslationsToManyLanguages:
+    dst = TranslationsToTheSameLanguage(Language.russian, list(units))
+    return TranslationsToManyLanguages(Language.turkish, [dst])
+
+
+def test_short_phrases_are_not_glossed() -> None:
+    assert Translator().gloss_min_words > len("kolay gelsin abi".split())
+
+
+def test_short_gloss_prefers_dictionaries() -> None:
+    machine = TranslationUnit(" кот ", "google.com", "")
+    dictionary = TranslationUnit("кошка, кот", "glosbe.com", "https://glosbe.com")
+    machines = {"google.com"}
+    assert short_gloss(to_russian(machine, dictionary).dsts[0], machines) == "кошка"
+    assert short_gloss(to_russian(machine).dsts[0], machines) == "кот"
+    assert short_gloss(to_russian().dsts[0], machines) == "?"
+
+
+def test_translations_without_url_are_not_linked() -> None:
+    sentence = to_russian(TranslationUnit("кошка спит", "local", ""))
+    gloss = Gloss(Language.turkish, sentence, {"kedi": to_russian()})
+    text = render_gloss("kedi uyuyor", gloss, set()).translation
+    assert "<b>local</b>: кошка спит" in text
+    assert 'href=""' not in text
@@ -0,0 +1,123 @@
+import asyncio
+from typing import Optional
+
+from aiohttp import ClientSession  # type: ignore
+import pytest
+
+from health import BreakerSettings, BreakerState, CircuitBreaker, ServiceHealth
+from languages import Language
+from translation import TranslationService, Translator, UpstreamError
+
+
+def failing_breaker(cool_down: float) -> CircuitBreaker:
+    settings = BreakerSettings(window=4, min_calls=2, cool_down=cool_down)
+    breaker = CircuitBreaker(settings)
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record(False, 0.1)
+    return breaker
+
+
+def test_breaker_opens_when_too_many_calls_fail() -> None:
+    breaker = CircuitBreaker(BreakerSettings(window=4, min_calls=2))
+    breaker.record(False, 0.1)
+    assert breaker.state == BreakerState.closed
+    breaker.record(False, 0.1)
+    assert breaker.state == BreakerState.open
+    assert not breaker.allow()
+    assert breaker.skipped == 1
+
+
+def test_breaker_stays_closed_below_the_threshold() -> None:
+    breaker = CircuitBreaker(BreakerSettings(window=4, min_calls=2))
+    for success in (True, True, False):
+        breaker.record(success, 0.1)
+    assert breaker.state == BreakerState.closed
+
+
+def test_single_probe_after_cool_down() -> None:
+    breaker = failing_breaker(cool_down=0)
+    assert breaker.allow()
+    assert breaker.state == BreakerState.half_open
+    assert not breaker.allow()
+
+
+def test_successful_probe_closes_breaker() -> None:
+    breaker = failing_breaker(cool_down=0)
+    assert breaker.allow()
+    breaker.record(True, 0.1)
+    assert breaker.state == BreakerState.closed
+    assert breaker.allow()
+
+
+def test_failed_probe_opens_breaker_again() -> None:
+    breaker = failing_breaker(cool_down=0)
+    assert breaker.allow()
+    breaker.record(False, 0.1)
+    assert breaker.state == BreakerState.open
+    assert not breaker.probe_in_flight
+
+
+def test_released_probe_lets_another_one_through() -> None:
+    breaker = failing_breaker(cool_down=0)
+    assert breaker.allow()
+    breaker.release_probe()
+    assert breaker.allow()
+
+
+class BrokenService(TranslationService):
+    "Raises an exception which is not an UpstreamError, e.g. a parsing bug."
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+
+    @property
+    def service_name(self) -> str:
+        return "broken"
+
+    async def translate(
+        self,
+        text: str,
+        src_language_code: str,
+        dst_language_code: str,
+        session: ClientSession,
+    ) -> Optional[tuple[str, str]]:
+        await asyncio.sleep(self.delay)
+        raise AttributeError("'NoneType' object has no attribute 'find'")
+
+
+async def guarded_translate(
+    translator: Translator, service: TranslationService
+) -> None:
+    await translator._guarded_translate(  # pylint: disable=protected-access
+        service, "kedi", Language.turkish, [Language.russian], None
+    )
+
+
+def test_unexpected_exception_is_recorded_as_a_failure() -> None:
+    translator = Translator(health=ServiceHealth(BreakerSettings(cool_down=0)))
+    breaker = translator.health.breaker("broken")
+    breaker.state = BreakerState.open
+    with pytest.raises(UpstreamError):
+        asyncio.run(guarded_translate(translator, BrokenService()))
+    assert breaker.failures == 1
+    assert breaker.state == BreakerState.open
+    assert not breaker.probe_in_flight
+
+
+def test_cancelled_probe_is_released() -> None:
+    translator = Translator(health=ServiceHealth(BreakerSettings(cool_down=0)))
+    breaker = translator.health.breaker("broken")
+    breaker.state = BreakerState.open
+
+    async def cancel_probe() -> None:
+        task = asyncio.create_task(guarded_translate(translator, BrokenService(10)))
+        await asyncio.sleep(0.01)
+        assert breaker.probe_in_flight
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_probe())
+    assert not breaker.probe_in_flight
+    assert breaker.calls == 0
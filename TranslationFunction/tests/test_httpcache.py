@@ -0,0 +1,119 @@
+import asyncio
+from pathlib import Path
+import time
+from typing import Optional
+
+from aiohttp import ClientSession, web  # type: ignore
+from aiohttp.test_utils import TestServer  # type: ignore
+import pytest
+
+from httpcache import HTTPCache
+from streaming import StreamTarget
+from translation import UpstreamError, make_request
+
+
+PAGE = '<div class="item_bsc">kedi</div>' + "<p>padding</p>" * 20000
+TARGET = StreamTarget("div", "class", ("item_bsc",))
+
+
+async def fetch_all(
+    cache: HTTPCache, stream_targets: list[Optional[StreamTarget]]
+) -> tuple[list[str], int]:
+    "Returns the pages and the number of requests the upstream has served."
+    requests = 0
+
+    async def page(_: web.Request) -> web.Response:
+        nonlocal requests
+        requests += 1
+        return web.Response(
+            text=PAGE, content_type="text/html", headers={"Cache-Control": "max-age=60"}
+        )
+
+    app = web.Application()
+    app.router.add_get("/page", page)
+    async with TestServer(app) as server, ClientSession() as session:
+        url = str(server.make_url("/page"))
+        pages = [
+            await make_request(url, session, cache=cache, stream_target=target)
+            for target in stream_targets
+        ]
+    return pages, requests
+
+
+def test_pages_read_up_to_the_target_are_cached() -> None:
+    cache = HTTPCache(":memory:", 2**20)
+    pages, requests = asyncio.run(fetch_all(cache, [TARGET, TARGET]))
+    assert requests == 1
+    assert pages[0] == pages[1]
+    assert "kedi" in pages[0] and len(pages[0]) < len(PAGE)
+
+
+def test_truncated_pages_dont_serve_requests_for_the_whole_page() -> None:
+    cache = HTTPCache(":memory:", 2**20)
+    pages, requests = asyncio.run(fetch_all(cache, [TARGET, None, None]))
+    assert requests == 2
+    assert pages[1] == pages[2] == PAGE
+
+
+HEADERS = {"Cache-Control": "max-age=60"}
+
+
+def test_least_recently_used_pages_are_evicted(tmp_path: Path) -> None:
+    cache = HTTPCache(str(tmp_path / "http.sqlite3"), max_size=250)
+    for url in ("a", "b", "c"):
+        cache.store_sync(url, "x" * 100, HEADERS)
+        time.sleep(0.01)
+    assert cache.lookup_sync("a") is None
+    # A lookup makes "b" the most recently used one once it's written.
+    assert cache.lookup_sync("b") is not None
+    cache.store_sync("d", "x" * 100, HEADERS)
+    assert cache.lookup_sync("c") is None
+    assert cache.lookup_sync("b") is not None
+    assert cache.total_size == 200
+
+
+def test_total_size_survives_restarts(tmp_path: Path) -> None:
+    cache = HTTPCache(str(tmp_path / "http.sqlite3"), max_size=1000)
+    cache.store_sync("a", "x" * 100, HEADERS)
+    cache.store_sync("a", "x" * 300, HEADERS)
+    assert cache.total_size == 300
+    restarted = HTTPCache(str(tmp_path / "http.sqlite3"), max_size=1000)
+    assert restarted.lookup_sync("a") is not None
+    assert restarted.total_size == 300
+
+
+def test_lookups_dont_write(tmp_path: Path) -> None:
+    cache = HTTPCache(str(tmp_path / "http.sqlite3"), max_size=1000)
+    cache.store_sync("a", "page", HEADERS)
+    assert cache.lookup_sync("a") is not None
+    assert not cache.connection.in_transaction
+    assert "a" in cache.accessed
+
+
+def test_uncacheable_responses_are_not_stored() -> None:
+    cache = HTTPCache(":memory:", max_size=1000)
+    cache.store_sync("a", "page", {"Cache-Control": "no-store"})
+    cache.store_sync("b", "page", {})
+    assert cache.lookup_sync("a") is None and cache.lookup_sync("b") is None
+    assert cache.misses == 2
+
+
+async def fetch_with_status(status: int) -> str:
+    async def page(_: web.Request) -> web.Response:
+        return web.Response(text="<p>error</p>", status=status)
+
+    app = web.Application()
+    app.router.add_get("/page", page)
+    async with TestServer(app) as server, ClientSession() as session:
+        return await make_request(str(server.make_url("/page")), session)
+
+
+@pytest.mark.parametrize("status", [400, 403, 429, 500, 503])
+def test_error_responses_fail(status: int) -> None:
+    with pytest.raises(UpstreamError):
+        asyncio.run(fetch_with_status(status))
+
+
+@pytest.mark.parametrize("status", [404, 410])
+def test_not_found_pages_are_answers(status: int) -> None:
+    assert asyncio.run(fetch_with_status(status)) == "<p>error</p>"
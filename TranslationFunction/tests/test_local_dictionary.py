@@ -0,0 +1,18 @@
+from pathlib import Path
+
+import pytest
+
+from translation import LocalDictionary, Translator
+
+
+def test_unconfigured_local_dictionary_is_not_routed(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    config = tmp_path / "config.ini"
+    config.write_text("[LOCAL DICTIONARY]\nPath:\n")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(Translator, "services", [])
+    monkeypatch.setattr(Translator, "routes", {})
+    Translator.register_service(LocalDictionary)
+    assert not Translator.services
+    assert not Translator.routes
@@ -0,0 +1,25 @@
+from bs4 import BeautifulSoup
+
+from conftest import FUNCTION_DIR
+from streaming import TargetWatcher
+from translation import Translator, TurengCom
+
+
+PAGE = (
+    FUNCTION_DIR / "benchmarks" / "pages" / "tureng.com" / "turkish_english_kedi.html"
+)
+
+
+def test_tureng_reads_only_the_results_table() -> None:
+    service = next(s for s in Translator.services if isinstance(s, TurengCom))
+    html = PAGE.read_text(encoding="utf-8")
+    end = html.index("</table>") + len("</table>")
+    head = html[:end]
+    watcher = TargetWatcher(service.stream_target("turkish", ["english"]))
+    watcher.feed(head)
+    assert watcher.done and end < len(html) / 2
+    strained = service.parser.parse(head, service.target("turkish", "english"))
+    full = BeautifulSoup(html, "html.parser")
+    translation = service.extract(strained, "turkish", "english")
+    assert translation == service.extract(full, "turkish", "english")
+    assert translation == "cat; puss; tomcat"
@@ -0,0 +1,102 @@
+import asyncio
+import time
+
+import pytest
+
+from ratelimit import HostLimiter, HostLimits, LoadShed, request_deadline
+
+
+def limiter(**limits: float) -> HostLimiter:
+    return HostLimiter("example.com", HostLimits(**limits))  # type: ignore
+
+
+async def use(host: HostLimiter) -> None:
+    async with host:
+        await asyncio.sleep(0.01)
+
+
+def test_requests_are_shed_against_the_callers_deadline() -> None:
+    async def run() -> None:
+        host = limiter(rate=1, burst=1, max_queue_time=0.1)
+        await host.acquire()
+        host.release()
+        # The next token is due in a second: too late for a caller
+        # with half a second left, in time for one with two seconds left.
+        with pytest.raises(LoadShed):
+            await host.acquire(time.monotonic() + 0.5)
+        assert host.queued == 0
+        token = request_deadline.set(time.monotonic() + 2)
+        try:
+            async with host:
+                pass
+        finally:
+            request_deadline.reset(token)
+        assert host.status()["requests"] == 2
+        assert host.status()["shed"] == 1
+
+    asyncio.run(run())
+
+
+def test_released_slots_wake_waiters() -> None:
+    async def run() -> None:
+        host = limiter(rate=1000, burst=10, max_concurrency=1)
+        await host.acquire()
+        waiter = asyncio.create_task(host.acquire(time.monotonic() + 5))
+        await asyncio.sleep(0.05)
+        assert not waiter.done() and host.queued == 1
+        started = time.monotonic()
+        host.release()
+        await waiter
+        assert time.monotonic() - started < 0.05
+        assert host.active == 1 and host.queued == 0
+
+    asyncio.run(run())
+
+
+def test_cancelled_waiters_leave_the_queue() -> None:
+    async def run() -> None:
+        host = limiter(rate=1000, burst=10, max_concurrency=1)
+        await host.acquire()
+        waiter = asyncio.create_task(host.acquire(time.monotonic() + 5))
+        await asyncio.sleep(0.05)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert host.queued == 0 and not host.waiters
+        host.release()
+        await host.acquire()
+        assert host.active == 1
+
+    asyncio.run(run())
+
+
+def test_waiters_for_a_slot_are_shed_at_the_deadline() -> None:
+    async def run() -> None:
+        host = limiter(rate=1000, burst=10, max_concurrency=1)
+        await host.acquire()
+        with pytest.raises(LoadShed):
+            await host.acquire(time.monotonic() + 0.05)
+        assert host.queued == 0 and not host.waiters
+
+    asyncio.run(run())
+
+
+def test_callers_without_a_deadline_queue() -> None:
+    async def run() -> None:
+        host = limiter(rate=20, burst=1, max_concurrency=1)
+        await asyncio.gather(*[use(host) for _ in range(5)])
+        assert host.status()["requests"] == 5
+        assert host.status()["shed"] == 0
+        assert host.queued == 0
+
+    asyncio.run(run())
+
+
+def test_max_queue_time_sheds_callers_without_a_deadline() -> None:
+    async def run() -> None:
+        host = limiter(rate=1, burst=1, max_queue_time=0.1)
+        await host.acquire()
+        with pytest.raises(LoadShed):
+            await host.acquire()
+
+    asyncio.run(run())
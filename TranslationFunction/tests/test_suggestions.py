@@ -0,0 +1,122 @@
+import asyncio
+from typing import Optional
+
+from aiohttp import ClientSession  # type: ignore
+
+from languages import Language
+from translation import (
+    FanOut,
+    TranslationService,
+    TranslationsToManyLanguages,
+    TranslationsToTheSameLanguage,
+    TranslationUnit,
+    Translator,
+    UpstreamError,
+)
+
+
+class Dictionary(TranslationService):
+    "Knows a single word, fails on every word if it's down."
+
+    def __init__(self, down: bool = False) -> None:
+        self.down = down
+
+    @property
+    def service_name(self) -> str:
+        return "dictionary"
+
+    async def translate(
+        self,
+        text: str,
+        src_language_code: str,
+        dst_language_code: str,
+        session: ClientSession,
+    ) -> Optional[tuple[str, str]]:
+        if self.down:
+            raise UpstreamError("dictionary is down")
+        return ("кошка", "") if text == "kedi" else None
+
+
+class Unconfigured(Dictionary):
+    "Like the local dictionary without an index."
+
+    @property
+    def service_name(self) -> str:
+        return "unconfigured"
+
+    @property
+    def enabled(self) -> bool:
+        return False
+
+
+class Machine(Dictionary):
+    "Answers for Google Translate, which translates anything."
+
+    machine = True
+
+    @property
+    def service_name(self) -> str:
+        return "google.com"
+
+    async def translate(
+        self,
+        text: str,
+        src_language_code: str,
+        dst_language_code: str,
+        session: ClientSession,
+    ) -> Optional[tuple[str, str]]:
+        return "кошка", ""
+
+
+def look_up(text: str, dictionary: Dictionary) -> TranslationsToManyLanguages:
+    fan_out = FanOut(Language.turkish, {Language.russian: [dictionary]})
+    asyncio.run(
+        Translator()._timed_translate(  # pylint: disable=protected-access
+            dictionary, text, Language.turkish, [Language.russian], None, fan_out
+        )
+    )
+    return fan_out.snapshot()
+
+
+def machine_only(failed: list[str]) -> TranslationsToManyLanguages:
+    "Translations of a word only Google Translate has answered for."
+    unit = TranslationUnit("кошка", "google.com", "")
+    timings = {"google.com": 0.1, "glosbe.com": 0.1}
+    dst = TranslationsToTheSameLanguage(
+        Language.russian, [unit], timings=timings, failed=failed
+    )
+    return TranslationsToManyLanguages(Language.turkish, [dst])
+
+
+def test_a_word_no_dictionary_knows_is_missed() -> None:
+    assert Translator().missed(machine_only(failed=[]))
+
+
+def test_a_word_is_not_missed_if_the_dictionaries_failed() -> None:
+    assert not Translator().missed(machine_only(failed=["glosbe.com"]))
+
+
+def test_failed_dictionaries_are_reported() -> None:
+    translations = look_up("kedi", Dictionary(down=True))
+    assert translations.dsts[0].failed == ["dictionary"]
+    assert not Translator().missed(translations)
+
+
+def test_unknown_words_are_missed() -> None:
+    translations = look_up("kedy", Dictionary())
+    assert translations.dsts[0].failed == []
+    assert Translator().missed(translations)
+    assert not Translator().missed(look_up("kedi", Dictionary()))
+
+
+def test_a_word_is_not_missed_if_the_only_answering_dictionary_is_disabled() -> None:
+    services = [Dictionary(down=True), Unconfigured(), Machine()]
+    fan_out = FanOut(Language.turkish, {Language.russian: services})
+    translator = Translator()
+    translator.loop.run(
+        translator._fan_out("kedi", fan_out)  # pylint: disable=protected-access
+    )
+    translations = fan_out.snapshot()
+    assert translations.dsts[0].failed == ["dictionary", "unconfigured"]
+    assert not translator.missed(translations)
+    translator.close()
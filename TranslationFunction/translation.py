@@ -1,35 +1,115 @@
 from abc import ABC, abstractmethod
 import asyncio
+from concurrent.futures import (
+    Future,
+    ThreadPoolExecutor,
+    TimeoutError as FutureTimeoutError,
+)
 from configparser import ConfigParser
-from dataclasses import dataclass
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass, field
+from functools import partial
 from io import StringIO
-from typing import Optional, Type, ClassVar
-
-from aiohttp import ClientSession, ClientSSLError  # type: ignore
-from bs4 import BeautifulSoup
+import os
+import re
+from itertools import permutations
+import math
+import threading
+import time
+from typing import Any, Iterable, Optional, Type, TypeAlias, ClassVar
+from urllib.parse import urlsplit
+
+from aiohttp import ClientError, ClientSession  # type: ignore
+from bs4 import BeautifulSoup, SoupStrainer
 from bs4.element import Tag, NavigableString
+from google.api_core.exceptions import GoogleAPICallError  # type: ignore
 from google.cloud import translate_v2 as translate  # type: ignore
 from emoji import emojize  # type: ignore
-from fake_useragent import UserAgent  # type: ignore
 
+from background import BackgroundLoop, SessionPool
+from cache import CacheKey, TranslationCache
+from health import BreakerSettings, ServiceHealth
+from httpcache import ACCEPT_ENCODING, HTTPCache
 from languages import (
     Language,
     ISO_639_codes,
-    detect_language,
     lang_to_flag,
     genitive_cases,
+    lowercase,
+)
+from detection import LanguageDetector
+from diacritics import DiacriticsIndex
+from fuzzy import FuzzyIndex
+from local_dictionary import MappedIndex, dictionary_key
+from parsing import SoupParser
+from ratelimit import (
+    HostLimiter,
+    HostLimits,
+    LoadShed,
+    host_limiters,
+    request_deadline,
 )
+from selection import AdaptiveSelection, input_shape
+from streaming import StreamTarget, read_until_target, streaming_enabled
+
+
+class UpstreamError(Exception):
+    "Raised when a translation service fails to respond in time or properly."
+
+
+class ServiceSkipped(UpstreamError):
+    "Raised instead of calling a service which is unhealthy or unlikely to answer."
+
+
+WORD = re.compile(r"[^\W\d_]+(?:['’][^\W\d_]+)*")
+"A word, possibly with suffixes after an apostrophe, e.g. Türkiye'de."
 
 
 async def make_request(
-    url: str, session: ClientSession, timeout: int = 3
-) -> str | None:
+    url: str,
+    session: ClientSession,
+    timeout: int = 3,
+    limiter: Optional[HostLimiter] = None,
+    cache: Optional[HTTPCache] = None,
+    stream_target: Optional[StreamTarget] = None,
+) -> str:
+    """
+    Gets the page, waiting for the host limiter first if one is given.
+    Fresh pages are served from the cache without touching the host,
+    stale ones are revalidated with a conditional request.
+    If a stream target is given, the download stops as soon as the target
+    elements are complete. Such pages are cached under the URL and the target,
+    so they serve later requests for the same target but not for the whole page.
+    Requests the limiter sheds are skipped rather than failed. Error responses
+    fail the request, except for 404 and 410, which are the host's answer
+    that it doesn't know the text, so such pages are not remembered as misses.
+    """
+    key = url if stream_target is None else f"{url}#{stream_target.key}"
+    cached = await cache.lookup(key) if cache is not None else None
+    if cached is not None and cached.fresh:
+        return cached.body
+    headers = {"Accept-Encoding": ACCEPT_ENCODING}
+    if cached is not None:
+        headers.update(cached.validators())
     try:
-        async with session.get(url=url, timeout=timeout) as r:
-            return await r.text()
-    except (ClientSSLError, asyncio.TimeoutError) as e:
-        print(e)
-        return None
+        async with limiter or nullcontext():
+            async with session.get(url=url, timeout=timeout, headers=headers) as r:
+                if r.status == 304 and cached is not None and cache is not None:
+                    await cache.revalidated(key, r.headers)
+                    return cached.body
+                if r.status >= 400 and r.status not in (404, 410):
+                    raise UpstreamError(f"{url} responded with {r.status}")
+                if stream_target is None:
+                    html = await r.text()
+                else:
+                    html, _ = await read_until_target(r, stream_target)
+                if r.status == 200 and cache is not None:
+                    await cache.store(key, html, r.headers)
+                return html
+    except LoadShed as e:
+        raise ServiceSkipped(str(e)) from e
+    except (ClientError, asyncio.TimeoutError) as e:
+        raise UpstreamError(f"{url}: {e!r}") from e
 
 
 @dataclass(slots=True)
@@ -37,6 +117,9 @@ class Translation:
     text: str
     translation: str
     language: Optional[Language] = None
+    pending: bool = False
+    timings: dict[str, dict[str, float]] = field(default_factory=dict)
+    suggestions: list[str] = field(default_factory=list)
 
 
 @dataclass(slots=True)
@@ -50,21 +133,155 @@ class TranslationUnit:
 class TranslationsToTheSameLanguage:
     src: Language
     translations: list[TranslationUnit]
+    pending: list[str] = field(default_factory=list)
+    timings: dict[str, float] = field(default_factory=dict)
+    failed: list[str] = field(default_factory=list)
+    "Services which failed or were skipped, so they don't know whether they know."
+
+
+@dataclass(slots=True)
+class TranslationsToManyLanguages:
+    src: Language
+    dsts: list[TranslationsToTheSameLanguage]
+
+    @property
+    def pending(self) -> bool:
+        return any(dst.pending for dst in self.dsts)
 
 
 @dataclass(slots=True)
-class TranslationsToBothLanguages:
+class Gloss:
     src: Language
-    dst_1: TranslationsToTheSameLanguage
-    dst_2: TranslationsToTheSameLanguage
+    sentence: TranslationsToManyLanguages
+    "Translations of the whole text by machine translators."
+    words: dict[str, TranslationsToManyLanguages]
+    "Translations of every distinct word of the text."
+
+    @property
+    def pending(self) -> bool:
+        return self.sentence.pending or any(w.pending for w in self.words.values())
 
 
-def get_translation(translator: "Translator", text: str) -> Translation:
+Routes: TypeAlias = dict[Language, list["TranslationService"]]
+"Services to call for each destination language."
+
+
+class FanOut:
+    """
+    Progress of translating a text to several languages via several services.
+    Results are filled in as the services answer, so a snapshot can be taken
+    before all of them are done. Host limiters shed requests of the fan-out
+    which can't start by its deadline (monotonic time).
+    """
+
+    def __init__(
+        self, src: Language, routes: Routes, deadline: Optional[float] = None
+    ) -> None:
+        self.src = src
+        self.routes = routes
+        self.deadline = deadline
+        self.results: dict[tuple[Language, str], Optional[TranslationUnit]] = {}
+        self.timings: dict[tuple[Language, str], float] = {}
+        self.failed: set[tuple[Language, str]] = set()
+        self.lock = threading.Lock()
+
+    def add(
+        self,
+        dst: Language,
+        service: "TranslationService",
+        unit: Optional[TranslationUnit],
+        elapsed: float,
+        failed: bool = False,
+    ) -> None:
+        "Reports the result of the service, failed if it has no answer at all."
+        with self.lock:
+            self.results[(dst, service.service_name)] = unit
+            self.timings[(dst, service.service_name)] = elapsed
+            if failed:
+                self.failed.add((dst, service.service_name))
+
+    def _snapshot_to(self, dst: Language) -> TranslationsToTheSameLanguage:
+        translations: list[TranslationUnit] = []
+        pending: list[str] = []
+        timings: dict[str, float] = {}
+        failed: list[str] = []
+        for service in self.routes[dst]:
+            key = (dst, service.service_name)
+            if key not in self.results:
+                pending.append(service.service_name)
+                continue
+            unit = self.results[key]
+            if unit is not None:
+                translations.append(unit)
+            if key in self.failed:
+                failed.append(service.service_name)
+            timings[service.service_name] = self.timings[key]
+        return TranslationsToTheSameLanguage(
+            dst, translations, pending, timings, failed
+        )
+
+    def snapshot(self) -> TranslationsToManyLanguages:
+        "Returns results received so far, services yet to answer are marked pending."
+        with self.lock:
+            dsts = [self._snapshot_to(dst) for dst in self.routes]
+        return TranslationsToManyLanguages(self.src, dsts)
+
+
+def get_translation(
+    translator: "Translator", text: str, soft_deadline: Optional[float] = None
+) -> Translation:
     """
     Given text of a message by an user, generates a content for a response message
     based on results by the translator instance.
+    If soft_deadline is given, services which haven't answered by then
+    are listed as pending.
+    Turkish letters are restored if the text is typed in ASCII.
+    Long texts are translated as a whole and glossed word by word.
+    If no dictionary knows the text, the closest known word is translated instead.
+    """
+    query = translator.restore(text)
+    if translator.gloss_min_words and len(query.split()) >= translator.gloss_min_words:
+        gloss = translator.gloss(query, soft_deadline)
+        if gloss is not None:
+            return render_gloss(
+                query, gloss, translator.machine_services, original=text
+            )
+    translations = translator.translate(query, soft_deadline)
+    suggestions = translator.suggest(query, translations)
+    if suggestions and translator.retry_suggestion:
+        retried = translator.translate(suggestions[0], soft_deadline)
+        if retried is not None and translator.dictionary_hits(retried):
+            return render_translation(
+                suggestions[0], retried, suggestions[1:], original=text, misspelled=True
+            )
+    return render_translation(query, translations, suggestions, original=text)
+
+
+def get_translations(translator: "Translator", texts: list[str]) -> list[Translation]:
+    """
+    Batch version of get_translation, responses are in the order of the texts.
+    Closest known words are suggested, but not translated.
+    """
+    queries = [translator.restore(text) for text in texts]
+    translations = translator.translate_batch(queries)
+    return [
+        render_translation(q, x, translator.suggest(q, x), original=t)
+        for t, q, x in zip(texts, queries, translations)
+    ]
+
+
+def render_translation(
+    text: str,
+    translations: Optional[TranslationsToManyLanguages],
+    suggestions: Optional[list[str]] = None,
+    original: Optional[str] = None,
+    misspelled: bool = False,
+) -> Translation:
+    """
+    Generates a content for a response message from results of translation.
+    original is the text as the user typed it, if it was corrected;
+    a misspelled original is mentioned in the message.
     """
-    translations = translator.translate(text)
     if translations is None:
         awkward_emoji = emojize(":downcast_face_with_sweat:")
         return Translation(text, f"Не смог распознать язык {awkward_emoji}.")
@@ -73,16 +290,99 @@ def get_translation(translator: "Translator", text: str) -> Translation:
     src_flag = lang_to_flag[src]
     src_gen = genitive_cases[src]
     result = StringIO()
+    if misspelled:
+        result.write(f'Не нашёл "<b>{original}</b>" в словарях.\n')
+    result.write(
+        f'Перевод для "<b>{text}</b>" с {src_flag}<b>{src_gen}</b>{src_flag} языка.\n\n'
+    )
+    for dst in translations.dsts:
+        dst_flag = lang_to_flag[dst.src]
+        result.write(f"{src_flag} ➔ {dst_flag}:\n")
+        for t in dst.translations:
+            if t.url:
+                result.write(f'<a href="{t.url}"><b>{t.service_name}</b></a>: ')
+            else:
+                result.write(f"<b>{t.service_name}</b>: ")
+            result.write(f"{t.text}.\n")
+        if dst.pending:
+            hourglass = emojize(":hourglass_not_done:")
+            result.write(f"{hourglass} Ещё ищу: {', '.join(dst.pending)}.\n")
+        result.write("\n")
+    if suggestions:
+        result.write(f"Возможно, вы имели в виду: {', '.join(suggestions)}.\n")
+    return Translation(
+        text=original if original is not None else text,
+        translation=result.getvalue(),
+        language=src,
+        pending=translations.pending,
+        timings={dst.src.name: dst.timings for dst in translations.dsts},
+        suggestions=suggestions or [],
+    )
+
+
+def short_gloss(translations: TranslationsToTheSameLanguage, machines: set[str]) -> str:
+    """
+    The first meaning given by a dictionary,
+    or the machine translation if no dictionary knows the word.
+    """
+    for unit in translations.translations:
+        if unit.service_name not in machines:
+            meaning = re.split(r"[,;.]", unit.text.strip())[0].strip()
+            if meaning:
+                return meaning
+    first = next(iter(translations.translations), None)
+    return first.text.strip() if first is not None else "?"
+
+
+def render_gloss(
+    text: str, gloss: Gloss, machines: set[str], original: Optional[str] = None
+) -> Translation:
+    """
+    Generates a content for a response message from the translation of a long text:
+    the translation of the whole text followed by the words and their meanings.
+    """
+    src_flag = lang_to_flag[gloss.src]
+    src_gen = genitive_cases[gloss.src]
+    width = max(len(word) for word in gloss.words) if gloss.words else 0
+    result = StringIO()
     result.write(
         f'Перевод для "<b>{text}</b>" с {src_flag}<b>{src_gen}</b>{src_flag} языка.\n\n'
     )
-    for dst in (translations.dst_1, translations.dst_2):
+    for i, dst in enumerate(gloss.sentence.dsts):
         dst_flag = lang_to_flag[dst.src]
         result.write(f"{src_flag} ➔ {dst_flag}:\n")
         for t in dst.translations:
-            result.write(f'<a href="{t.url}"><b>{t.service_name}</b></a>: {t.text}.\n')
+            if t.url:
+                result.write(f'<a href="{t.url}"><b>{t.service_name}</b></a>: ')
+            else:
+                result.write(f"<b>{t.service_name}</b>: ")
+            result.write(f"{t.text}\n")
+        for word, translations in gloss.words.items():
+            meaning = short_gloss(translations.dsts[i], machines)
+            result.write(f"<code>{word.ljust(width)}</code> {meaning}\n")
+        pending = sorted(
+            set(dst.pending).union(*(w.dsts[i].pending for w in gloss.words.values()))
+        )
+        if pending:
+            hourglass = emojize(":hourglass_not_done:")
+            result.write(f"{hourglass} Ещё ищу: {', '.join(pending)}.\n")
         result.write("\n")
-    return Translation(text=text, translation=result.getvalue(), language=src)
+    return Translation(
+        text=original if original is not None else text,
+        translation=result.getvalue(),
+        language=gloss.src,
+        pending=gloss.pending,
+        timings={dst.src.name: dst.timings for dst in gloss.sentence.dsts},
+    )
+
+
+LanguagePairs: TypeAlias = frozenset[tuple[Language, Language]]
+"Combinations (src, dst) of languages."
+
+
+def language_pairs(languages: Iterable[Language]) -> LanguagePairs:
+    "All the (src, dst) pairs of different languages."
+    return frozenset((src, dst) for src, dst in permutations(languages, 2))
 
 
 class TranslationService(ABC):
@@ -91,12 +391,31 @@ class TranslationService(ABC):
     Each service should implement following methods:
         - translate;
         - representing_url;
-        - supported_languages (if not all language combinations are supported).
+        - supported_languages (if not all language combinations are supported);
+        - enabled (optional), which keeps a service that can't answer unregistered.
+
+    supported_languages is a class attribute, so it is not rebuilt on every call.
 
     If the service uses an encoding different to ISO-639-1, the method language_encodings
     should be overridden.
     """
 
+    cacheable: ClassVar[bool] = True
+    "Whether results of the service are stored in the translation cache."
+    adaptive: ClassVar[bool] = True
+    "Whether calls may be skipped when the service rarely answers for such input."
+    shared_page: ClassVar[bool] = False
+    "Whether a single request to the service answers for all destination languages."
+    machine: ClassVar[bool] = False
+    "Whether the service translates any input, known word or not."
+    supported_languages: ClassVar[LanguagePairs] = language_pairs(Language)
+    """
+    A set of supported combinations of languages.
+    Each element is a tuple (l1, l2) of two Language instances.
+    Translation from l1 to l2 is supported iff tuple (l1, l2) is present in the set.
+    Should be overridden if not all combinations of languages are supported.
+    """
+
     @abstractmethod
     async def translate(
         self,
@@ -112,6 +431,16 @@ class TranslationService(ABC):
     def service_name(self) -> str:
         raise NotImplementedError
 
+    @property
+    def host(self) -> Optional[str]:
+        "Host the service sends requests to, if it does."
+        return None
+
+    @property
+    def enabled(self) -> bool:
+        "Whether the service can answer at all, e.g. is configured."
+        return True
+
     @property
     def language_encoding(self) -> dict[Language, str]:
         """
@@ -121,22 +450,25 @@ class TranslationService(ABC):
         """
         return {}
 
-    @property
-    def supported_languages(self) -> set[tuple[Language, Language]]:
+    async def translate_many(
+        self,
+        text: str,
+        src_language_code: str,
+        dst_language_codes: list[str],
+        session: ClientSession,
+    ) -> dict[str, Optional[tuple[str, str]]]:
         """
-        A set of supported combinations of languages.
-        Each element is a tuple (l1, l2) of two Language instances.
-        Translation from l1 to l2 is supported iff tuple (l1, l2) is present in the set.
-        Should be overridden if not all combinations of languages are supported.
+        Translates the text to several languages, the result is keyed by their codes.
+        Calls translate for each language, should be overridden by services
+        with shared_page to make a single request.
         """
-        return {
-            (Language.russian, Language.turkish),
-            (Language.turkish, Language.russian),
-            (Language.russian, Language.english),
-            (Language.english, Language.russian),
-            (Language.turkish, Language.english),
-            (Language.english, Language.turkish),
-        }
+        responses = await asyncio.gather(
+            *[
+                self.translate(text, src_language_code, code, session)
+                for code in dst_language_codes
+            ]
+        )
+        return dict(zip(dst_language_codes, responses))
 
     async def wrap_translate(
         self, text: str, src: Language, dst: Language, session: ClientSession
@@ -147,22 +479,35 @@ class TranslationService(ABC):
         - encodes languages via encode_language method;
         - calls translate method and wraps result in a Translation object.
         """
-        if (src, dst) not in self.supported_languages:
-            return None
-        src_language_code = self._encode_language(src)
-        dst_language_code = self._encode_language(dst)
-        response = await self.translate(
+        units = await self.wrap_translate_many(text, src, [dst], session)
+        return units[dst]
+
+    async def wrap_translate_many(
+        self, text: str, src: Language, dsts: list[Language], session: ClientSession
+    ) -> dict[Language, Optional[TranslationUnit]]:
+        "Same as wrap_translate, but for several languages via translate_many."
+        units: dict[Language, Optional[TranslationUnit]] = {dst: None for dst in dsts}
+        codes = {
+            dst: self._encode_language(dst)
+            for dst in dsts
+            if (src, dst) in self.supported_languages
+        }
+        if not codes:
+            return units
+        responses = await self.translate_many(
             text,
-            src_language_code,
-            dst_language_code,
+            self._encode_language(src),
+            list(codes.values()),
             session,
         )
-        if response is None:
-            return None
-
-        translated_text, url = response
-        print(f"{self.__class__.__name__} : {text}")
-        return TranslationUnit(translated_text, self.service_name, url)
+        for dst, code in codes.items():
+            response = responses.get(code)
+            if response is None:
+                continue
+            translated_text, url = response
+            print(f"{self.__class__.__name__} : {text}")
+            units[dst] = TranslationUnit(translated_text, self.service_name, url)
+        return units
 
     def _encode_language(self, language: Language) -> str:
         """
@@ -181,63 +526,554 @@ class Translator:
     """
 
     services: ClassVar[list[TranslationService]] = []
+    routes: ClassVar[dict[tuple[Language, Language], list[TranslationService]]] = {}
+    "Services supporting each (src, dst) pair in the order of registration."
+    target_languages: list[Language] = field(
+        default_factory=lambda: [Language.russian, Language.turkish, Language.english]
+    )
+    cache: Optional[TranslationCache] = None
+    health: ServiceHealth = field(default_factory=ServiceHealth)
+    selection: Optional[AdaptiveSelection] = None
+    soft_deadline: Optional[float] = None
+    max_soft_deadline: float = 10.0
+    "Longer soft deadlines asked for by clients are cut down to this."
+    batch_concurrency: int = 16
+    max_batch_size: int = 100
+    "Longer batches sent by clients are rejected."
+    detector: LanguageDetector = field(default_factory=LanguageDetector)
+    min_confidence: float = 0.8
+    "Below this confidence the text is translated from the two most likely languages."
+    diacritics: Optional[DiacriticsIndex] = None
+    "Index restoring Turkish letters in text typed in ASCII."
+    fuzzy: Optional[FuzzyIndex] = None
+    "Index of known words to suggest when no dictionary knows the text."
+    max_suggestions: int = 3
+    retry_suggestion: bool = True
+    "Whether the closest known word is translated when no dictionary knows the text."
+    gloss_min_words: int = 5
+    "Texts with at least this many words are glossed, 0 turns glossing off."
+    gloss_max_words: int = 20
+    "Only the first distinct words of a long text are glossed."
+    gloss_concurrency: int = 8
+    loop: BackgroundLoop = field(default_factory=BackgroundLoop)
+    sessions: SessionPool = field(default_factory=SessionPool)
+    in_flight: dict[tuple[str, Language], tuple[Future, FanOut]] = field(
+        default_factory=dict
+    )
+    in_flight_lock: threading.Lock = field(default_factory=threading.Lock)
+
+    @classmethod
+    def from_config(cls, path: str = "config.ini") -> "Translator":
+        config = ConfigParser()
+        config.read(path)
+        section = config["TRANSLATOR"]
+        soft_deadline = section.get("Soft deadline", "")
+        fuzzy_section = config["FUZZY"]
+        fuzzy_path = fuzzy_section.get("Path", "")
+        gloss_section = config["GLOSS"]
+        detection_section = config["DETECTION"]
+        target_languages = section.get("Target languages", "russian, turkish, english")
+        return cls(
+            target_languages=[
+                Language[name.strip()] for name in target_languages.split(",")
+            ],
+            cache=TranslationCache.from_config(path),
+            health=ServiceHealth(BreakerSettings.from_config(path)),
+            selection=AdaptiveSelection.from_config(path),
+            sessions=SessionPool.from_config(path),
+            soft_deadline=float(soft_deadline) if soft_deadline else None,
+            max_soft_deadline=section.getfloat("Max soft deadline", 10.0),
+            batch_concurrency=section.getint("Batch concurrency", 16),
+            max_batch_size=section.getint("Max batch size", 100),
+            detector=LanguageDetector.from_config(path),
+            min_confidence=detection_section.getfloat("Min confidence", 0.8),
+            diacritics=DiacriticsIndex.from_config(path),
+            fuzzy=FuzzyIndex(fuzzy_path) if os.path.exists(fuzzy_path) else None,
+            max_suggestions=fuzzy_section.getint("Max suggestions", 3),
+            retry_suggestion=fuzzy_section.getboolean("Retry", True),
+            gloss_min_words=gloss_section.getint("Min words", 5),
+            gloss_max_words=gloss_section.getint("Max words", 20),
+            gloss_concurrency=gloss_section.getint("Concurrency", 8),
+        )
 
     @classmethod
     def register_service(
         cls, service_type: Type[TranslationService]
     ) -> Type[TranslationService]:
-        "Decorator for service registration."
+        """
+        Decorator for service registration.
+        Disabled services are neither registered nor routed.
+        """
         service = service_type()
+        if not service.enabled:
+            print(f"{service.service_name} is disabled")
+            return service_type
         cls.services.append(service)
+        for pair in service.supported_languages:
+            cls.routes.setdefault(pair, []).append(service)
         return service_type
 
-    def translate(self, text: str) -> Optional[TranslationsToBothLanguages]:
+    def route(self, src: Language) -> Routes:
+        "Services to call for each target language when translating from src."
+        return {
+            dst: self.routes.get((src, dst), [])
+            for dst in self.target_languages
+            if dst != src
+        }
+
+    def close(self, timeout: float = 5.0) -> None:
+        """
+        Closes the pooled sessions and stops the background loop,
+        calling it again does nothing.
+        """
+        if not self.loop.running:
+            return
+        try:
+            self.loop.run(self.sessions.close(), timeout)
+        except FutureTimeoutError:
+            print(f"Sessions are not closed in {timeout}s")
+        finally:
+            self.loop.stop(timeout)
+
+    def parse_soft_deadline(self, value: Any) -> Optional[float]:
+        """
+        Validates a soft deadline in seconds asked for by a client, None if none is.
+        Raises ValueError unless it is a non-negative number or a string of one,
+        longer deadlines are cut down to max_soft_deadline.
+        """
+        if value is None:
+            return None
+        if isinstance(value, bool):
+            raise ValueError(f"Invalid deadline: {value!r}")
+        try:
+            seconds = float(value)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Invalid deadline: {value!r}") from e
+        if math.isnan(seconds) or seconds < 0:
+            raise ValueError(f"Invalid deadline: {value!r}")
+        return min(seconds, self.max_soft_deadline)
+
+    def parse_batch(self, value: Any) -> list[str]:
+        """
+        Validates texts of a batch sent by a client.
+        Raises ValueError unless it is a list of at most max_batch_size strings.
+        """
+        if not isinstance(value, list) or not all(isinstance(t, str) for t in value):
+            raise ValueError("Texts must be a list of strings")
+        if len(value) > self.max_batch_size:
+            raise ValueError(f"At most {self.max_batch_size} texts are translated")
+        return value
+
+    def detect(self, text: str) -> Optional[Language]:
+        "The most likely of the target languages to be the language of the text."
+        return self.detector.detect(text, self.target_languages)
+
+    def sources(self, text: str) -> list[Language]:
+        """
+        Languages to translate the text from: the most likely one,
+        or the two most likely ones if the detector is not confident enough.
+        Only the target languages are considered, texts are never translated
+        from a language the translator isn't configured for.
+        Without detection tables only the preferred language is used.
+        """
+        scores = self.detector.scores(text, self.target_languages)
+        if not scores:
+            return []
+        (top, confidence), *rest = scores
+        if not rest or not self.detector.languages or confidence >= self.min_confidence:
+            return [top]
+        return [top, rest[0][0]]
+
+    def restore(self, text: str) -> str:
+        """
+        Restores Turkish letters if the text could be Turkish typed in ASCII.
+        Only words found in the diacritics index are changed, so the text isn't
+        required to be detected as Turkish, which ASCII-typed words often aren't.
+        """
+        if self.diacritics is None:
+            return text
+        candidates = self.detector.candidates(text, self.target_languages)
+        if Language.turkish not in candidates:
+            return text
+        return self.diacritics.restore(text)
+
+    @property
+    def machine_services(self) -> set[str]:
+        return {s.service_name for s in self.services if s.machine}
+
+    def dictionary_hits(self, translations: TranslationsToManyLanguages) -> int:
+        "Number of translations by services other than machine translators."
+        return sum(
+            unit.service_name not in self.machine_services
+            for dst in translations.dsts
+            for unit in dst.translations
+        )
+
+    def missed(self, translations: TranslationsToManyLanguages) -> bool:
+        """
+        Checks if all the services have answered, no dictionary knew the text
+        and at least one of them has actually looked it up.
+        Dictionaries which failed or were skipped don't count, so during
+        an outage correctly spelled words are not "corrected".
+        """
+        if translations.pending or self.dictionary_hits(translations):
+            return False
+        machine_services = self.machine_services
+        return any(
+            name not in machine_services and name not in dst.failed
+            for dst in translations.dsts
+            for name in dst.timings
+        )
+
+    def suggest(
+        self, text: str, translations: Optional[TranslationsToManyLanguages]
+    ) -> list[str]:
+        "Returns known words close to the text if no dictionary knows it."
+        if self.fuzzy is None or translations is None or not self.missed(translations):
+            return []
+        return self.fuzzy.candidates(text, translations.src, self.max_suggestions)
+
+    def is_cached(self, text: str) -> bool:
+        """
+        Checks if every cacheable service has a cached result for the text,
+        i.e. translating it would not call any of them.
+        """
+        src = self.detect(text)
+        if src is None or self.cache is None:
+            return False
+        for dst, services in self.route(src).items():
+            for service in services:
+                if not service.cacheable:
+                    continue
+                key = (lowercase(text, src), src.name, dst.name, service.service_name)
+                if not self.cache.peek(key):
+                    return False
+        return True
+
+    def translate(
+        self, text: str, soft_deadline: Optional[float] = None
+    ) -> Optional[TranslationsToManyLanguages]:
         """
         Detects the language of the text and returns aggregated results of translation
-        to all supported languages via all registered services.
+        to all target languages via all registered services supporting them.
+        If the language is ambiguous, the text is translated from the two most likely
+        languages and the results known to more dictionaries are returned.
+
+        If a soft deadline (in seconds) is given, returns results received by then.
+        The services still pending keep running in the background, so their results
+        end up in the cache and are served to the next request for the same text.
+        Requests that can't get past the host limiters by then are shed instead.
+        Concurrent requests for the same text share one fan-out.
+        """
+        sources = self.sources(text)
+        if not sources:
+            return None
+        if soft_deadline is None:
+            soft_deadline = self.soft_deadline
+        deadline = None if soft_deadline is None else time.monotonic() + soft_deadline
+        flights = [self._join_flight(text, src, deadline) for src in sources]
+        for future, _ in flights:
+            timeout = None if deadline is None else max(0, deadline - time.monotonic())
+            try:
+                future.result(timeout=timeout)
+            except FutureTimeoutError:
+                print(f"Soft deadline of {soft_deadline}s passed for {text}")
+                break
+        # max keeps the first, i.e. the most likely language, on ties.
+        return max(
+            (fan_out.snapshot() for _, fan_out in flights), key=self.dictionary_hits
+        )
+
+    def _join_flight(
+        self, text: str, src: Language, deadline: Optional[float] = None
+    ) -> tuple[Future, FanOut]:
+        """
+        Returns the fan-out in flight for the same text or starts a new one,
+        so concurrent requests for the same text share a single fan-out.
+        """
+        key = (" ".join(lowercase(text, src).split()), src)
+        with self.in_flight_lock:
+            if key in self.in_flight:
+                print(f"Joining the translation in flight for {text}")
+                return self.in_flight[key]
+            fan_out = FanOut(src, self.route(src), deadline)
+            future = self.loop.submit(self._translate(text, fan_out))
+            self.in_flight[key] = (future, fan_out)
+
+        def land(_: Future) -> None:
+            with self.in_flight_lock:
+                if self.in_flight.get(key, (None,))[0] is future:
+                    del self.in_flight[key]
+
+        future.add_done_callback(land)
+        return future, fan_out
+
+    def translate_batch(
+        self, texts: list[str]
+    ) -> list[Optional[TranslationsToManyLanguages]]:
+        """
+        Translates many texts at once, results are in the order of the texts.
+        Texts which are the same after lowercasing are translated only once.
+        All lookups share one session, at most batch_concurrency run at a time.
+        """
+        fan_outs: dict[str, FanOut] = {}
+        keys: list[Optional[str]] = []
+        for text in texts:
+            src = self.detect(text)
+            if src is None:
+                keys.append(None)
+                continue
+            key = " ".join(lowercase(text, src).split())
+            keys.append(key)
+            if key not in fan_outs:
+                fan_outs[key] = FanOut(src, self.route(src))
+        self.loop.run(self._translate_batch(fan_outs, self.batch_concurrency))
+        return [fan_outs[key].snapshot() if key is not None else None for key in keys]
+
+    def gloss(
+        self, text: str, soft_deadline: Optional[float] = None
+    ) -> Optional[Gloss]:
+        """
+        Translates a long text as a whole via machine translators only
+        and every distinct word of it via all the services.
+        Cached words are served from the cache, at most gloss_concurrency
+        service calls run at a time, so long texts don't flood the upstreams.
         """
-        src = detect_language(text)
+        src = self.detect(text)
         if src is None:
             return None
-        dst_1, dst_2 = [x for x in Language if x != src]
-        return TranslationsToBothLanguages(
+        if soft_deadline is None:
+            soft_deadline = self.soft_deadline
+        deadline = None if soft_deadline is None else time.monotonic() + soft_deadline
+        routes = self.route(src)
+        sentence = FanOut(
             src,
-            self.translate_to_the_language(text, src, dst_1),
-            self.translate_to_the_language(text, src, dst_2),
+            {
+                dst: [s for s in services if s.machine]
+                for dst, services in routes.items()
+            },
+            deadline,
+        )
+        words = [re.split("['’]", word)[0] for word in WORD.findall(text)]
+        tokens = list(dict.fromkeys(lowercase(word, src) for word in words))
+        tokens = tokens[: self.gloss_max_words]
+        fan_outs = {token: FanOut(src, routes, deadline) for token in tokens}
+        future = self.loop.submit(
+            self._translate_batch({text: sentence, **fan_outs}, self.gloss_concurrency)
+        )
+        try:
+            future.result(timeout=soft_deadline)
+        except FutureTimeoutError:
+            print(f"Soft deadline of {soft_deadline}s passed for {text}")
+        return Gloss(
+            src,
+            sentence.snapshot(),
+            {token: fan_out.snapshot() for token, fan_out in fan_outs.items()},
         )
 
-    def translate_to_the_language(
-        self, text: str, src: Language, dst: Language
-    ) -> TranslationsToTheSameLanguage:
-        translations = asyncio.run(self._translate_to_the_language(text, src, dst))
-        return TranslationsToTheSameLanguage(
-            dst, [t for t in translations if t is not None]
+    async def _translate(self, text: str, fan_out: FanOut) -> None:
+        """
+        Translates the text to all the languages at once:
+        every (service, dst) pair is gathered concurrently.
+        """
+        await self._fan_out(text, fan_out)
+
+    async def _translate_batch(
+        self, fan_outs: dict[str, FanOut], concurrency: int
+    ) -> None:
+        semaphore = asyncio.Semaphore(concurrency)
+        await asyncio.gather(
+            *[
+                self._fan_out(text, fan_out, semaphore)
+                for text, fan_out in fan_outs.items()
+            ]
         )
 
-    async def _translate_to_the_language(
-        self, text: str, src: Language, dst: Language
-    ) -> list[Optional[TranslationUnit]]:
-        to_gather = []
-        async with ClientSession(headers={"UserAgent": UserAgent().random}) as session:
-            for service in self.services:
-                to_gather.append(service.wrap_translate(text, src, dst, session))
-            return await asyncio.gather(*to_gather)
+    async def _fan_out(
+        self,
+        text: str,
+        fan_out: FanOut,
+        semaphore: Optional[asyncio.Semaphore] = None,
+    ) -> None:
+        """
+        Calls every routed service, each one through the pooled session of its host.
+        Services with shared_page are called once for all their languages.
+        """
+        request_deadline.set(fan_out.deadline)
+        by_service: dict[TranslationService, list[Language]] = {}
+        for dst, services in fan_out.routes.items():
+            for service in services:
+                by_service.setdefault(service, []).append(dst)
+        calls = []
+        for service, service_dsts in by_service.items():
+            session = self.sessions.get(service.host)
+            if service.shared_page:
+                groups = [service_dsts]
+            else:
+                groups = [[dst] for dst in service_dsts]
+            for dsts in groups:
+                calls.append(
+                    self._timed_translate(
+                        service, text, fan_out.src, dsts, session, fan_out, semaphore
+                    )
+                )
+        await asyncio.gather(*calls)
+
+    async def _timed_translate(
+        self,
+        service: TranslationService,
+        text: str,
+        src: Language,
+        dsts: list[Language],
+        session: ClientSession,
+        fan_out: FanOut,
+        semaphore: Optional[asyncio.Semaphore] = None,
+    ) -> None:
+        "Calls the service and reports the results with their timing to the fan-out."
+        async with semaphore or nullcontext():
+            start = time.perf_counter()
+            units, failed = await self._cached_translate(
+                service, text, src, dsts, session
+            )
+            elapsed = time.perf_counter() - start
+        for dst, unit in units.items():
+            fan_out.add(dst, service, unit, elapsed, failed=dst in failed)
+
+    async def _cached_translate(
+        self,
+        service: TranslationService,
+        text: str,
+        src: Language,
+        dsts: list[Language],
+        session: ClientSession,
+    ) -> tuple[dict[Language, Optional[TranslationUnit]], set[Language]]:
+        """
+        Looks the translations up in the cache before calling the service
+        and stores the results of the call, including the absence of a translation.
+        Only the languages missing in the cache are requested.
+        Returns the translations and the languages the call failed
+        or was skipped for, which are not stored.
+        """
+        units: dict[Language, Optional[TranslationUnit]] = {dst: None for dst in dsts}
+        if not service.enabled:
+            # It can't even look the text up, so its silence is not a miss.
+            return units, set(dsts)
+        cache = self.cache if service.cacheable else None
+        keys: dict[Language, CacheKey] = {}
+        for dst in dsts:
+            if (src, dst) not in service.supported_languages:
+                continue
+            key = (lowercase(text, src), src.name, dst.name, service.service_name)
+            if cache is not None:
+                found, value = await cache.lookup(key)
+                if found:
+                    units[dst] = None if value is None else TranslationUnit(**value)
+                    continue
+            keys[dst] = key
+        if not keys:
+            return units, set()
+
+        try:
+            translated = await self._guarded_translate(
+                service, text, src, list(keys), session
+            )
+        except UpstreamError as e:
+            print(e)
+            return units, set(keys)
+        units.update(translated)
+        if cache is not None:
+            cache.put_many(
+                {
+                    keys[dst]: asdict(unit) if unit is not None else None
+                    for dst, unit in translated.items()
+                }
+            )
+        # Languages the service rarely answers for were skipped.
+        return units, set(keys) - set(translated)
+
+    async def _guarded_translate(
+        self,
+        service: TranslationService,
+        text: str,
+        src: Language,
+        dsts: list[Language],
+        session: ClientSession,
+    ) -> dict[Language, Optional[TranslationUnit]]:
+        """
+        Calls the service through its circuit breaker:
+        the call is skipped while the breaker is open, its outcome is recorded.
+        Any exception of the service counts as a failure and is raised
+        as UpstreamError, a call which is skipped or cancelled releases the probe.
+        Languages the service rarely answers for with such input are skipped as well.
+        """
+        name = service.service_name
+        shape = input_shape(text)
+        if self.selection is not None and service.adaptive:
+            selection = self.selection
+            dsts = [
+                dst
+                for dst in dsts
+                if selection.should_call((name, src.name, dst.name, shape))
+            ]
+            if not dsts:
+                raise ServiceSkipped(f"{name} is skipped, rarely answers")
+        breaker = self.health.breaker(name)
+        if not breaker.allow():
+            raise ServiceSkipped(f"{name} is skipped, circuit is open")
+        start = time.perf_counter()
+        success: Optional[bool] = None
+        try:
+            units = await service.wrap_translate_many(text, src, dsts, session)
+            success = True
+        except ServiceSkipped:
+            raise
+        except UpstreamError:
+            success = False
+            raise
+        except Exception as e:  # pylint: disable=broad-except
+            success = False
+            raise UpstreamError(f"{name} failed: {e!r}") from e
+        finally:
+            if success is None:
+                breaker.release_probe()
+            else:
+                breaker.record(success, time.perf_counter() - start)
+        elapsed = time.perf_counter() - start
+        if self.selection is not None and service.adaptive:
+            for dst, unit in units.items():
+                key = (name, src.name, dst.name, shape)
+                self.selection.record(key, unit is not None, elapsed)
+        return units
 
 
 @Translator.register_service
-class DemekRu(TranslationService):
-    URL = "https://demek.ru/soz/?q={}"
+class LocalDictionary(TranslationService):
+    """
+    Answers from a prebuilt dictionary file instead of the network,
+    see local_dictionary.py for the format and the builder.
+    The service is not registered if the file is not configured.
+    """
+
+    cacheable = False
+    adaptive = False
+
+    def __init__(self, path: str = "config.ini") -> None:
+        super().__init__()
+        config = ConfigParser()
+        config.read(path)
+        index_path = config["LOCAL DICTIONARY"]["Path"]
+        self.index: Optional[MappedIndex] = None
+        if index_path and os.path.exists(index_path):
+            self.index = MappedIndex(index_path)
+            print(f"Local dictionary with {len(self.index)} entries is loaded")
 
     @property
     def service_name(self) -> str:
-        return "demek.ru"
+        return "словарь"
 
     @property
-    def supported_languages(self) -> set[tuple[Language, Language]]:
-        return {
-            (Language.russian, Language.turkish),
-            (Language.turkish, Language.russian),
-        }
+    def enabled(self) -> bool:
+        return self.index is not None
 
     async def translate(
         self,
@@ -246,27 +1082,108 @@ class DemekRu(TranslationService):
         dst_language_code: str,
         session: ClientSession,
     ) -> Optional[tuple[str, str]]:
-        query = "+".join(text.split())
-        url = self.URL.format(query)
-        html = await make_request(url, session)
-        if html is None:
+        if self.index is None:
             return None
-
-        soup = BeautifulSoup(html, "html.parser")
-        search_result = soup.find("div", "item_bsc")
-        if search_result is None:
+        key = dictionary_key(src_language_code, dst_language_code, text)
+        translated_text = self.index.get(key)
+        if translated_text is None:
             return None
-        translated_text = search_result.get_text()
-        return translated_text, url
+        return translated_text, ""
 
 
-@Translator.register_service
-class GlosbeCom(TranslationService):
-    URL = "https://glosbe.com/{}/{}/{}"
+class ScrapingService(TranslationService):
+    """
+    ABC for a service scraping a dictionary page.
+    Each service should implement following methods:
+        - build_url;
+        - extract, which finds the translation in the soup of the page;
+        - target (optional), which limits parsing to the subtree used by extract;
+        - stream_target (optional), which tells when the rest of the page is not needed.
+    """
+
+    URL: ClassVar[str]
+    parser: ClassVar[SoupParser] = SoupParser.from_config()
+    limits: ClassVar[HostLimits] = HostLimits()
+    "Rate limit and concurrency cap of requests to the host of the service."
+    http_cache: ClassVar[Optional[HTTPCache]] = HTTPCache.from_config()
+    "Cache of the fetched pages shared by all scraping services."
+    streaming: ClassVar[bool] = streaming_enabled()
+    "Stop downloading pages once the stream target is complete."
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.limiter = host_limiters.get(urlsplit(self.URL).netloc, self.limits)
 
     @property
-    def service_name(self) -> str:
-        return "glosbe.com"
+    def host(self) -> Optional[str]:
+        return urlsplit(self.URL).netloc
+
+    @abstractmethod
+    def build_url(
+        self, text: str, src_language_code: str, dst_language_code: str
+    ) -> str:
+        raise NotImplementedError
+
+    @abstractmethod
+    def extract(
+        self, soup: BeautifulSoup, src_language_code: str, dst_language_code: str
+    ) -> Optional[str]:
+        raise NotImplementedError
+
+    def target(
+        self, src_language_code: str, dst_language_code: str
+    ) -> Optional[SoupStrainer]:
+        """
+        Describes the part of the page extract needs.
+        None means the whole page has to be parsed.
+        """
+        return None
+
+    def shared_target(
+        self, src_language_code: str, dst_language_codes: list[str]
+    ) -> Optional[SoupStrainer]:
+        """
+        Describes the part of a shared page extract needs for all the languages.
+        None means the whole page has to be parsed.
+        """
+        if len(dst_language_codes) == 1:
+            return self.target(src_language_code, dst_language_codes[0])
+        return None
+
+    def stream_target(
+        self, src_language_code: str, dst_language_codes: list[str]
+    ) -> Optional[StreamTarget]:
+        """
+        Describes the elements extract needs for all the languages,
+        the download stops once they are complete.
+        None means the whole page has to be downloaded.
+        """
+        return None
+
+    async def fetch(
+        self,
+        url: str,
+        src_language_code: str,
+        dst_language_codes: list[str],
+        session: ClientSession,
+    ) -> str:
+        stream_target = None
+        if self.streaming:
+            stream_target = self.stream_target(src_language_code, dst_language_codes)
+        return await make_request(
+            url,
+            session,
+            limiter=self.limiter,
+            cache=self.http_cache,
+            stream_target=stream_target,
+        )
+
+    def extract_from_html(
+        self, html: str, src_language_code: str, dst_language_code: str
+    ) -> Optional[str]:
+        target = self.target(src_language_code, dst_language_code)
+        soup = self.parser.parse(html, target)
+        return self.extract(soup, src_language_code, dst_language_code)
 
     async def translate(
         self,
@@ -275,44 +1192,249 @@ class GlosbeCom(TranslationService):
         dst_language_code: str,
         session: ClientSession,
     ) -> Optional[tuple[str, str]]:
-        query = "%20".join(text.split())
-        url = self.URL.format(src_language_code, dst_language_code, query)
-        html = await make_request(url, session)
-        if html is None:
+        url = self.build_url(text, src_language_code, dst_language_code)
+        html = await self.fetch(url, src_language_code, [dst_language_code], session)
+        translated_text = self.extract_from_html(
+            html, src_language_code, dst_language_code
+        )
+        if translated_text is None:
+            return None
+        return translated_text, url
+
+    async def translate_many(
+        self,
+        text: str,
+        src_language_code: str,
+        dst_language_codes: list[str],
+        session: ClientSession,
+    ) -> dict[str, Optional[tuple[str, str]]]:
+        """
+        Fetches and parses a shared page once and extracts the translations
+        to all the languages from it.
+        """
+        if not self.shared_page:
+            return await super().translate_many(
+                text, src_language_code, dst_language_codes, session
+            )
+        url = self.build_url(text, src_language_code, dst_language_codes[0])
+        html = await self.fetch(url, src_language_code, dst_language_codes, session)
+        target = self.shared_target(src_language_code, dst_language_codes)
+        soup = self.parser.parse(html, target)
+        results: dict[str, Optional[tuple[str, str]]] = {}
+        for code in dst_language_codes:
+            translated_text = self.extract(soup, src_language_code, code)
+            if translated_text is not None:
+                results[code] = translated_text, url
+        return results
+
+
+@Translator.register_service
+class DemekRu(ScrapingService):
+    URL = "https://demek.ru/soz/?q={}"
+    supported_languages = frozenset(
+        {
+            (Language.russian, Language.turkish),
+            (Language.turkish, Language.russian),
+        }
+    )
+
+    @property
+    def service_name(self) -> str:
+        return "demek.ru"
+
+    def build_url(
+        self, text: str, src_language_code: str, dst_language_code: str
+    ) -> str:
+        query = "+".join(text.split())
+        return self.URL.format(query)
+
+    def target(
+        self, src_language_code: str, dst_language_code: str
+    ) -> Optional[SoupStrainer]:
+        return SoupStrainer("div", "item_bsc")
+
+    def stream_target(
+        self, src_language_code: str, dst_language_codes: list[str]
+    ) -> Optional[StreamTarget]:
+        return StreamTarget("div", "class", ("item_bsc",))
+
+    def extract(
+        self, soup: BeautifulSoup, src_language_code: str, dst_language_code: str
+    ) -> Optional[str]:
+        search_result = soup.find("div", "item_bsc")
+        if search_result is None:
             return None
+        return search_result.get_text()
+
+
+@Translator.register_service
+class GlosbeCom(ScrapingService):
+    URL = "https://glosbe.com/{}/{}/{}"
+    limits = HostLimits(rate=2.0, burst=4, max_concurrency=2)
+
+    @property
+    def service_name(self) -> str:
+        return "glosbe.com"
+
+    def build_url(
+        self, text: str, src_language_code: str, dst_language_code: str
+    ) -> str:
+        query = "%20".join(text.split())
+        return self.URL.format(src_language_code, dst_language_code, query)
+
+    def target(
+        self, src_language_code: str, dst_language_code: str
+    ) -> Optional[SoupStrainer]:
+        return SoupStrainer("p", attrs={"id": "content-summary"})
+
+    def stream_target(
+        self, src_language_code: str, dst_language_codes: list[str]
+    ) -> Optional[StreamTarget]:
+        return StreamTarget("p", "id", ("content-summary",))
 
-        soup = BeautifulSoup(html, "html.parser")
+    def extract(
+        self, soup: BeautifulSoup, src_language_code: str, dst_language_code: str
+    ) -> Optional[str]:
         summary_section = soup.find("p", attrs={"id": "content-summary"})
         if summary_section is None:
             return None
         bold_text = summary_section.find("strong")
         if bold_text is None or isinstance(bold_text, int):
             return None
-        translated_text = bold_text.get_text()
-        return translated_text, url
+        return bold_text.get_text()
 
 
 @dataclass
 class GoogleTranslateClient:
+    """
+    Wraps the blocking google translate client.
+    Calls are run in a bounded thread pool, so they don't block the event loop.
+    """
+
     client: translate.Client
+    executor: ThreadPoolExecutor
+    timeout: float = 3
 
     @classmethod
     def from_config(cls, path: str = "config.ini") -> "GoogleTranslateClient":
         config = ConfigParser()
         config.read(path)
-        gcloud_key_path = config["GOOGLE TRANSLATE"]["Key path"]
+        section = config["GOOGLE TRANSLATE"]
+        gcloud_key_path = section["Key path"]
         return cls(
             translate.Client.from_service_account_json(gcloud_key_path),
+            ThreadPoolExecutor(
+                max_workers=section.getint("Max workers", 4),
+                thread_name_prefix="google-translate",
+            ),
+            section.getfloat("Timeout", 3),
         )
 
+    async def translate(
+        self, texts: list[str], src_language_code: str, dst_language_code: str
+    ) -> list[dict[str, str]]:
+        "Translates all the texts with a single API request."
+        loop = asyncio.get_running_loop()
+        call = partial(
+            self.client.translate,
+            values=texts,
+            source_language=src_language_code,
+            target_language=dst_language_code,
+        )
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(self.executor, call), self.timeout
+            )
+        except (GoogleAPICallError, asyncio.TimeoutError) as e:
+            raise UpstreamError(f"google translate: {e!r}") from e
+
+
+@dataclass
+class GoogleBatcher:
+    """
+    Merges calls for the same language pair arriving within a short window
+    into one API request with a list of values and fans the results back out.
+    Must be used from coroutines running on the background loop.
+    """
+
+    client: GoogleTranslateClient
+    window: float = 0.005
+    "Seconds the first call of a batch waits for others to join."
+    max_batch_size: int = 32
+    "A full batch is sent without waiting for the window to pass."
+    pending: dict[tuple[str, str], list[tuple[str, asyncio.Future]]] = field(
+        default_factory=dict
+    )
+    timers: dict[tuple[str, str], asyncio.TimerHandle] = field(default_factory=dict)
+    tasks: set[asyncio.Task] = field(default_factory=set)
+    requests: int = 0
+    values: int = 0
+
+    @classmethod
+    def from_config(
+        cls, client: GoogleTranslateClient, path: str = "config.ini"
+    ) -> "GoogleBatcher":
+        config = ConfigParser()
+        config.read(path)
+        section = config["GOOGLE TRANSLATE"]
+        return cls(
+            client,
+            window=section.getfloat("Batch window", 0.005),
+            max_batch_size=section.getint("Max batch size", 32),
+        )
+
+    async def translate(
+        self, text: str, src_language_code: str, dst_language_code: str
+    ) -> dict[str, str]:
+        loop = asyncio.get_running_loop()
+        key = (src_language_code, dst_language_code)
+        future = loop.create_future()
+        batch = self.pending.setdefault(key, [])
+        batch.append((text, future))
+        if len(batch) >= self.max_batch_size:
+            self._flush(key)
+        elif len(batch) == 1:
+            self.timers[key] = loop.call_later(self.window, self._flush, key)
+        return await future
+
+    def _flush(self, key: tuple[str, str]) -> None:
+        timer = self.timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self.pending.pop(key, [])
+        if batch:
+            task = asyncio.create_task(self._send(key, batch))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def _send(
+        self, key: tuple[str, str], batch: list[tuple[str, asyncio.Future]]
+    ) -> None:
+        texts = list(dict.fromkeys(text for text, _ in batch))
+        self.requests += 1
+        self.values += len(texts)
+        try:
+            responses = await self.client.translate(texts, *key)
+        except Exception as e:  # pylint: disable=broad-except
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        by_text = dict(zip(texts, responses))
+        for text, future in batch:
+            if not future.done():
+                future.set_result(by_text[text])
+
 
 @Translator.register_service
 class GoogleTranslate(TranslationService):
     URL = "https://translate.google.com/?sl={}&tl={}&text={}&op=translate"
+    machine = True
 
     def __init__(self) -> None:
         super().__init__()
         self.client = GoogleTranslateClient.from_config()
+        self.batcher = GoogleBatcher.from_config(self.client)
 
     @property
     def service_name(self) -> str:
@@ -325,10 +1447,8 @@ class GoogleTranslate(TranslationService):
         dst_language_code: str,
         session: ClientSession,
     ) -> Optional[tuple[str, str]]:
-        response = self.client.client.translate(
-            values=text,
-            source_language=src_language_code,
-            target_language=dst_language_code,
+        response = await self.batcher.translate(
+            text, src_language_code, dst_language_code
         )
         translated_text = response["translatedText"]
 
@@ -338,29 +1458,45 @@ class GoogleTranslate(TranslationService):
 
 
 @Translator.register_service
-class TurkcesozlukNet(TranslationService):
+class TurkcesozlukNet(ScrapingService):
     URL = "https://www.turkcesozluk.net/index.php?word={}"
+    shared_page = True
+    supported_languages = language_pairs(
+        [Language.russian, Language.turkish, Language.english]
+    )
 
     @property
     def service_name(self) -> str:
         return "turkcesozluk.net"
 
-    async def translate(
-        self,
-        text: str,
-        src_language_code: str,
-        dst_language_code: str,
-        session: ClientSession,
-    ) -> Optional[tuple[str, str]]:
+    def build_url(
+        self, text: str, src_language_code: str, dst_language_code: str
+    ) -> str:
         query = "+".join(text.split())
-        url = self.URL.format(query)
-
-        html = await make_request(url, session)
-        if html is None:
-            return None
+        return self.URL.format(query)
 
+    def target(
+        self, src_language_code: str, dst_language_code: str
+    ) -> Optional[SoupStrainer]:
+        name_attr = src_language_code + dst_language_code
+        return SoupStrainer("table", {"name": name_attr})
+
+    def shared_target(
+        self, src_language_code: str, dst_language_codes: list[str]
+    ) -> Optional[SoupStrainer]:
+        name_attrs = [src_language_code + code for code in dst_language_codes]
+        return SoupStrainer("table", {"name": name_attrs})
+
+    def stream_target(
+        self, src_language_code: str, dst_language_codes: list[str]
+    ) -> Optional[StreamTarget]:
+        name_attrs = tuple(src_language_code + code for code in dst_language_codes)
+        return StreamTarget("table", "name", name_attrs)
+
+    def extract(
+        self, soup: BeautifulSoup, src_language_code: str, dst_language_code: str
+    ) -> Optional[str]:
         name_attr = src_language_code + dst_language_code
-        soup = BeautifulSoup(html, "html.parser")
         table = soup.find("table", {"name": name_attr})
         if table is None or isinstance(table, NavigableString):
             return None
@@ -370,38 +1506,50 @@ class TurkcesozlukNet(TranslationService):
         cell = first_row.find_all("td")[1]
         list = cell.find("ul", {"class": "ulc"})
         if list is None:
-            return cell.get_text(), url
+            return cell.get_text()
         points = list.find_all("li", limit=5)
 
-        translated_text = " ".join(p.get_text() for p in points)
-        return translated_text, url
+        return " ".join(p.get_text() for p in points)
 
 
 @Translator.register_service
-class TurengCom(TranslationService):
+class TurengCom(ScrapingService):
     URL = "https://tureng.com/en/turkish-english/{}"
+    RESULTS_TABLE = "englishResultsTable"
+    supported_languages = frozenset(
+        {
+            (Language.english, Language.turkish),
+            (Language.turkish, Language.english),
+        }
+    )
 
     @property
     def service_name(self) -> str:
         return "tureng.com"
 
-    async def translate(
-        self,
-        text: str,
-        src_language_code: str,
-        dst_language_code: str,
-        session: ClientSession,
-    ) -> Optional[tuple[str, str]]:
+    def build_url(
+        self, text: str, src_language_code: str, dst_language_code: str
+    ) -> str:
         query = "%20".join(text.split())
-        url = self.URL.format(query)
-
-        html = await make_request(url, session)
-        if html is None:
-            return None
-
+        return self.URL.format(query)
+
+    def target(
+        self, src_language_code: str, dst_language_code: str
+    ) -> Optional[SoupStrainer]:
+        # The header telling the direction of the dictionary and the tables.
+        return SoupStrainer(["h2", "table"])
+
+    def stream_target(
+        self, src_language_code: str, dst_language_codes: list[str]
+    ) -> Optional[StreamTarget]:
+        # The header comes right before the table of the results.
+        return StreamTarget("table", "id", (self.RESULTS_TABLE,))
+
+    def extract(
+        self, soup: BeautifulSoup, src_language_code: str, dst_language_code: str
+    ) -> Optional[str]:
         string = f"{dst_language_code} {src_language_code} dictionary".title()
         dst_language = Language[dst_language_code]
-        soup = BeautifulSoup(html, "html.parser")
 
         def h2_with_right_text(tag: Tag) -> bool:
             return tag.name == "h2" and string in tag.get_text()
@@ -409,25 +1557,13 @@ class TurengCom(TranslationService):
         h2 = soup.find(h2_with_right_text)
         if h2 is None:
             return None
-
-        before_table = h2.next_sibling
-        if before_table is None:
-            return None
-        table = before_table.next_sibling
-        if table is None:
+        table = h2.find_next("table")
+        if table is None or isinstance(table, NavigableString):
             return None
-        translations = table.find_all_next(
+        translations = table.find_all(
             "td", {"lang": ISO_639_codes[dst_language]}, limit=5
         )
-        translated_text = "; ".join([t.get_text().strip() for t in translations])
-        return translated_text, url
-
-    @property
-    def supported_languages(self) -> set[tuple[Language, Language]]:
-        return {
-            (Language.english, Language.turkish),
-            (Language.turkish, Language.english),
-        }
+        return "; ".join([t.get_text().strip() for t in translations])
 
     @property
     def language_encoding(self) -> dict[Language, str]: